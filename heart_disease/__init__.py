@@ -0,0 +1,58 @@
+"""Heart disease and cardiac arrhythmia prediction pipeline.
+
+The notebook in ``heart_disease_prediction.py`` is split into importable
+functions for loading, preprocessing, training and scoring. Submodules are
+only imported when one of their names is first accessed, and matplotlib,
+seaborn and tensorflow are only imported by the functions that need them, so
+``import heart_disease`` stays cheap for scoring workers.
+"""
+import importlib
+
+_EXPORTS = {
+    "load_cleveland": "data",
+    "read_cleveland": "data",
+    "iter_cleveland": "data",
+    "load_arrhythmia": "data",
+    "ingest_arrhythmia": "data",
+    "load_harmonized": "harmonize",
+    "split_and_scale": "preprocessing",
+    "preprocess_arrhythmia": "preprocessing",
+    "split_arrhythmia": "preprocessing",
+    "FeatureStore": "features",
+    "cleveland_models": "models",
+    "train_models": "models",
+    "cross_validate": "crossval",
+    "score_model": "evaluation",
+    "score_models": "evaluation",
+    "evaluate_predictions": "evaluation",
+    "describe_by_target": "summary",
+    "render_report": "report",
+    "save_artifact": "scoring",
+    "Scorer": "scoring",
+    "train_zoo": "zoo",
+    "train_incremental": "incremental",
+    "compile_trees": "trees",
+    "compile_linear": "linear",
+    "NeighborIndex": "neighbors",
+    "train_network": "neural",
+}
+
+_SUBMODULES = ("cache", "crossval", "data", "features", "harmonize", "incremental", "linear", "memo", "preprocessing", "models", "neighbors", "neural", "evaluation", "plots", "predict", "report", "schema", "scoring", "summary", "synthetic", "tracing", "trees", "zoo")
+
+__all__ = list(_EXPORTS) + list(_SUBMODULES)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        value = importlib.import_module("." + name, __name__)
+    elif name in _EXPORTS:
+        module = importlib.import_module("." + _EXPORTS[name], __name__)
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
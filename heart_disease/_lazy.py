@@ -0,0 +1,18 @@
+"""Deferred imports for the heavy plotting and deep-learning libraries.
+
+Each helper imports its library on first call; later calls hit the
+``sys.modules`` cache, so they are cheap to use inside functions.
+"""
+import importlib
+
+
+def pyplot():
+    return importlib.import_module("matplotlib.pyplot")
+
+
+def seaborn():
+    return importlib.import_module("seaborn")
+
+
+def tensorflow():
+    return importlib.import_module("tensorflow")
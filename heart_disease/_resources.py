@@ -0,0 +1,58 @@
+"""Process memory measurement shared by the benchmark and tracing code."""
+import os
+import resource
+import sys
+import threading
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def current_rss():
+    """Resident set size of this process in bytes.
+
+    Read from ``/proc/self/statm`` on Linux; elsewhere falls back to the
+    lifetime peak reported by ``getrusage``.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return peak_rss()
+
+
+def peak_rss():
+    """Lifetime peak resident set size of this process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class RSSSampler:
+    """Context manager tracking the peak RSS while its block runs.
+
+    A daemon thread polls ``current_rss`` every ``interval`` seconds; after
+    the block, ``start``, ``end`` and ``peak`` hold the readings in bytes.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.start = self.end = self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _poll(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+    def __enter__(self):
+        self.start = self.peak = current_rss()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.end = current_rss()
+        self.peak = max(self.peak, self.end)
+        return False
@@ -0,0 +1,172 @@
+"""Stage-level benchmarks on synthetic data of increasing size.
+
+Run with::
+
+    python -m heart_disease.benchmark --scales 1 100 10000 --out benchmark.json
+
+Every scale multiplies the size of the real datasets (297 Cleveland rows,
+452 arrhythmia rows). Each stage records wall time, peak RSS while it ran and
+throughput in rows/s; the JSON output is stable-ordered so two runs can be
+diffed between commits. Stages whose cost grows faster than linearly have a
+row cap and are reported as skipped above it, and whole scales above
+``--max-rows`` are skipped the same way; ``CAPS_HELP`` lists the caps and
+why each is there.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import sklearn
+
+from . import data, memo, models, preprocessing
+from ._resources import RSSSampler
+from .synthetic import ARRHYTHMIA_ROWS, CLEVELAND_ROWS, synthetic_arrhythmia, write_synthetic_cleveland
+
+SCALES = (1, 100, 10000, 1000000)
+# The x1000000 Cleveland frame (297M rows) needs ~33 GB as float64 before the
+# split copies it, so the default skips that scale; raise --max-rows to run it.
+MAX_ROWS = 5000000
+
+# Row caps for stages that scale superlinearly (SVC is quadratic in the
+# training rows, the SVM grid holds four Gram matrices).
+STAGE_MAX_ROWS = {
+    'fit:SVC_model': 50000,
+    'pca_sweep': 200000,
+    'svm_grid': 5000,
+}
+
+IMPORT_BUDGET = 0.5
+
+CAPS_HELP = f"""\
+row caps:
+  --max-rows {MAX_ROWS:<9} whole scales above this many Cleveland rows are skipped;
+                       the default excludes x1000000 (297M rows, ~33 GB in memory)
+  fit:SVC_model {STAGE_MAX_ROWS['fit:SVC_model']:<6} SVC training is quadratic in rows (x1 and x100 run)
+  pca_sweep {STAGE_MAX_ROWS['pca_sweep']:<10} full SVD of the 278-column matrix (x1 and x100 run)
+  svm_grid {STAGE_MAX_ROWS['svm_grid']:<11} 4 kernels x 7 C values of SVC fits (only x1 runs)
+capped stages are reported with status 'skipped: over N rows'.
+"""
+
+
+def _skip(results, stage, scale, rows, reason):
+    results.append({'stage': stage, 'scale': scale, 'rows': rows, 'status': f'skipped: {reason}'})
+
+
+def _record(results, stage, scale, rows, func):
+    """Time ``func`` as ``stage`` and append its row; returns its result, or None if capped."""
+    cap = STAGE_MAX_ROWS.get(stage)
+    if cap is not None and rows > cap:
+        _skip(results, stage, scale, rows, f'over {cap} rows')
+        return None
+    with RSSSampler() as rss:
+        start = time.perf_counter()
+        value = func()
+        wall = time.perf_counter() - start
+    results.append({
+        'stage': stage,
+        'scale': scale,
+        'rows': rows,
+        'status': 'ok',
+        'wall_s': round(wall, 6),
+        'peak_rss_mb': round(rss.peak / 2 ** 20, 2),
+        'rows_per_s': round(rows / wall, 1) if wall > 0 else None,
+    })
+    return value
+
+
+def bench_import(results):
+    """Cold ``import heart_disease`` in a fresh interpreter."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'import heart_disease'], check=True,
+                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    wall = time.perf_counter() - start
+    results.append({'stage': 'import', 'scale': None, 'rows': None, 'wall_s': round(wall, 6),
+                    'budget_s': IMPORT_BUDGET, 'status': 'ok' if wall <= IMPORT_BUDGET else 'over budget'})
+
+
+def bench_cleveland(results, scale, workdir):
+    rows = CLEVELAND_ROWS * scale
+    path = write_synthetic_cleveland(os.path.join(workdir, f'cleveland_x{scale}.csv'), rows)
+    heart_df = _record(results, 'load', scale, rows, lambda: data.load_cleveland(path))
+    os.remove(path)
+
+    x_train, x_test, y_train, y_test, _ = _record(results, 'split_scale', scale, rows,
+                                                  lambda: preprocessing.split_and_scale(heart_df))
+    del heart_df
+    for name, model in models.cleveland_models().items():
+        if _record(results, f'fit:{name}', scale, len(x_train), lambda: model.fit(x_train, y_train)) is None:
+            _skip(results, f'predict:{name}', scale, len(x_test), 'model not fitted')
+        else:
+            _record(results, f'predict:{name}', scale, len(x_test), lambda: model.predict(x_test))
+
+
+def bench_arrhythmia(results, scale):
+    rows = ARRHYTHMIA_ROWS * scale
+    if rows > STAGE_MAX_ROWS['pca_sweep']:
+        _skip(results, 'pca_sweep', scale, rows, f"over {STAGE_MAX_ROWS['pca_sweep']} rows")
+        _skip(results, 'svm_grid', scale, rows, f"over {STAGE_MAX_ROWS['svm_grid']} rows")
+        return
+    X, y = synthetic_arrhythmia(rows)
+    split = int(rows * 0.7)
+    X_train, X_test, Y_train, Y_test = X[:split], X[split:], y[:split], y[split:]
+    pca_dict, _ = _record(results, 'pca_sweep', scale, rows, lambda: preprocessing.pca_sweep(X_train))
+    if rows > STAGE_MAX_ROWS['svm_grid']:
+        _skip(results, 'svm_grid', scale, rows, f"over {STAGE_MAX_ROWS['svm_grid']} rows")
+        return
+    X_train_pca, X_test_pca, _ = preprocessing.fit_pca(X_train, X_test, preprocessing.select_pca_components(pca_dict))
+    _record(results, 'svm_grid', scale, rows, lambda: models.svm_grid(X_train_pca, Y_train, X_test_pca, Y_test))
+
+
+def run(scales=SCALES, max_rows=MAX_ROWS):
+    """Run every stage at every scale and return the benchmark document."""
+    results = []
+    bench_import(results)
+    # Memoized fits would turn every run after the first into a timing of cache hits
+    with memo.disabled(), tempfile.TemporaryDirectory() as workdir:
+        for scale in scales:
+            if CLEVELAND_ROWS * scale > max_rows:
+                _skip(results, '*', scale, CLEVELAND_ROWS * scale, f'over --max-rows {max_rows}')
+                continue
+            bench_cleveland(results, scale, workdir)
+            bench_arrhythmia(results, scale)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'sklearn': sklearn.__version__,
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0], epilog=CAPS_HELP,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=list(SCALES),
+                        help='multiples of the real dataset sizes (default: %(default)s)')
+    parser.add_argument('--max-rows', type=int, default=MAX_ROWS,
+                        help='skip scales with more Cleveland rows than this (default: %(default)s, '
+                             'which skips x1000000)')
+    parser.add_argument('--out', default='benchmark.json', help='output JSON file (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    document = run(args.scales, args.max_rows)
+    with open(args.out, 'w') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write('\n')
+    for row in document['results']:
+        timing = f"{row['wall_s']:.4f}s" if 'wall_s' in row else ''
+        print(f"{row['stage']:<20} x{row['scale'] or '-':<8} {timing:>12}  {row['status']}")
+
+
+if __name__ == '__main__':
+    main()
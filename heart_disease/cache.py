@@ -0,0 +1,106 @@
+"""On-disk cache of parsed datasets as memory-mappable ``.npy`` arrays.
+
+Each entry is a directory under the cache root holding one ``.npy`` file per
+array and a ``manifest.json`` that records the sha256 of the source bytes the
+arrays were parsed from. The manifest is written last, so an entry without one
+is incomplete and treated as missing.
+
+The cache root defaults to ``~/.cache/heart_disease`` and can be moved with
+the ``HEART_DISEASE_CACHE`` environment variable. Setting
+``HEART_DISEASE_OFFLINE=1`` makes loaders serve only what is cached and never
+touch the network.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+CACHE_DIR = os.environ.get('HEART_DISEASE_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'heart_disease'))
+
+MANIFEST = 'manifest.json'
+
+
+def offline_mode():
+    """True when ``HEART_DISEASE_OFFLINE`` is set to anything but ``''``/``'0'``."""
+    return os.environ.get('HEART_DISEASE_OFFLINE', '') not in ('', '0')
+
+
+def content_hash(raw):
+    return hashlib.sha256(raw).hexdigest()
+
+
+def entry_dir(name, cache_dir=None):
+    return os.path.join(cache_dir or CACHE_DIR, name)
+
+
+def read_manifest(name, cache_dir=None):
+    """The manifest of a complete cache entry, or ``None``."""
+    try:
+        with open(os.path.join(entry_dir(name, cache_dir), MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _invalidate(directory):
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, MANIFEST)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    return manifest_path
+
+
+def allocate(name, key, shape, dtype, cache_dir=None):
+    """Writable ``.npy`` memory map for array ``key`` of entry ``name``.
+
+    Large arrays can be filled in place and then passed to ``store``, which
+    flushes them instead of writing them a second time. The entry reads as
+    missing from this call until ``store`` completes it.
+    """
+    directory = entry_dir(name, cache_dir)
+    _invalidate(directory)
+    return np.lib.format.open_memmap(os.path.join(directory, key + '.npy'), mode='w+', dtype=dtype, shape=shape)
+
+
+def store(name, arrays, manifest, cache_dir=None):
+    """Write ``{key: ndarray}`` and ``manifest`` as cache entry ``name``.
+
+    Files are written under temporary names and moved into place, with the
+    manifest last, so readers never see a partially written entry. Arrays
+    from ``allocate`` are already in place and are only flushed.
+    """
+    directory = entry_dir(name, cache_dir)
+    manifest_path = _invalidate(directory)
+
+    manifest = dict(manifest, arrays={})
+    for key, array in arrays.items():
+        path = os.path.join(directory, key + '.npy')
+        if isinstance(array, np.memmap) and os.path.abspath(array.filename) == os.path.abspath(path):
+            array.flush()
+        else:
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+        manifest['arrays'][key] = {'dtype': array.dtype.str, 'shape': list(array.shape)}
+
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+
+def load(name, cache_dir=None, mmap_mode='r'):
+    """Return ``(arrays, manifest)`` for entry ``name``, memory-mapped by default.
+
+    Raises ``FileNotFoundError`` when the entry does not exist.
+    """
+    manifest = read_manifest(name, cache_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"no cached dataset {name!r} in {cache_dir or CACHE_DIR}")
+    directory = entry_dir(name, cache_dir)
+    arrays = {key: np.load(os.path.join(directory, key + '.npy'), mmap_mode=mmap_mode)
+              for key in manifest['arrays']}
+    return arrays, manifest
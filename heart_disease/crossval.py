@@ -0,0 +1,87 @@
+"""K-fold cross-validation of several models with shared per-fold preprocessing.
+
+Every fold's preprocessing (a scaler by default, or any transformer such as
+an imputer/scaler/PCA pipeline) is fitted once on that fold's training rows
+only, and the transformed train and test matrices are shared by every model
+evaluated on the fold. Folds are preprocessed and models fitted in a thread
+pool: a fold's models are queued as soon as its preprocessing finishes, and
+``iter_cross_validate`` yields each (fold, model) result as it completes.
+sklearn's tree, SVM, linear and neighbour code releases the GIL while
+fitting, so the threads use separate cores without copying the fold data.
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import StandardScaler
+
+from .tracing import stage
+
+
+def _preprocess(fold, preprocess, X, y, train, test):
+    transformer = clone(preprocess)
+    with stage('cv_preprocess', X, fold=fold, transformer=type(transformer).__name__):
+        x_train = transformer.fit_transform(X[train], y[train])
+        x_test = transformer.transform(X[test])
+    return fold, x_train, x_test
+
+
+def _fit_and_score(fold, name, model, x_train, y_train, x_test, y_test):
+    model = clone(model)
+    with stage('fit', x_train, model=name, fold=fold):
+        start = time.perf_counter()
+        model.fit(x_train, y_train)
+        fit_time = time.perf_counter() - start
+    with stage('predict', x_test, model=name, fold=fold) as span:
+        y_pred = span.output(model.predict(x_test))
+    return {
+        'fold': fold,
+        'model': name,
+        'accuracy': accuracy_score(y_test, y_pred),
+        'fit_time': fit_time,
+        'n_train': len(y_train),
+        'n_test': len(y_test),
+    }
+
+
+def iter_cross_validate(models, X, y, n_splits=5, preprocess=None, random_state=42, max_workers=None):
+    """Yield one result dict per (fold, model) in completion order.
+
+    ``models`` is a ``{name: unfitted estimator}`` dict and ``preprocess`` an
+    unfitted transformer (``StandardScaler()`` by default); both are cloned
+    per fold. Folds are stratified and shuffled with ``random_state``.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    preprocess = StandardScaler() if preprocess is None else preprocess
+    folds = list(StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state).split(X, y))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {pool.submit(_preprocess, fold, preprocess, X, y, train, test)
+                   for fold, (train, test) in enumerate(folds)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if isinstance(result, dict):
+                    yield result
+                    continue
+                fold, x_train, x_test = result
+                train, test = folds[fold]
+                pending |= {pool.submit(_fit_and_score, fold, name, model, x_train, y[train], x_test, y[test])
+                            for name, model in models.items()}
+
+
+def cross_validate(models, X, y, n_splits=5, preprocess=None, random_state=42, max_workers=None):
+    """All ``iter_cross_validate`` results as a frame indexed by (model, fold)."""
+    results = list(iter_cross_validate(models, X, y, n_splits, preprocess, random_state, max_workers))
+    return pd.DataFrame(results).set_index(['model', 'fold']).sort_index()
+
+
+def summarize(results):
+    """Mean and standard deviation of accuracy and fit time per model."""
+    return results.groupby(level='model')[['accuracy', 'fit_time']].agg(['mean', 'std'])
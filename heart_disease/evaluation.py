@@ -0,0 +1,138 @@
+"""Scoring of fitted classifiers on held-out data."""
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+
+from .tracing import stage
+
+
+def score_model(model, x_test, y_test):
+    """Predict once and return accuracy, classification report, confusion matrix and ``y_pred``."""
+    with stage('predict', x_test, model=type(model).__name__) as span:
+        y_pred = span.output(model.predict(x_test))
+    return dict(score_predictions(y_test, y_pred), y_pred=y_pred)
+
+
+def score_predictions(y_test, y_pred):
+    """Accuracy, classification report and confusion matrix of ``y_pred``."""
+    return {
+        'accuracy': accuracy_score(y_test, y_pred),
+        'report': classification_report(y_test, y_pred, zero_division=0),
+        'confusion_matrix': confusion_matrix(y_test, y_pred),
+    }
+
+
+def score_models(models, x_test, y_test):
+    """``score_model`` for every entry of a ``{name: fitted model}`` dict."""
+    return {name: score_model(model, x_test, y_test) for name, model in models.items()}
+
+
+def print_scores(scores):
+    """Print a ``score_model`` result the way the notebook does."""
+    print('Classification Report\n', scores['report'])
+    print('Accuracy: {}%\n'.format(round(scores['accuracy'] * 100, 2)))
+    print(scores['confusion_matrix'])
+
+
+def _f1(confusion):
+    """Per-class precision, recall and F1 of ``(..., K, K)`` confusion matrices (0 where undefined)."""
+    tp = np.diagonal(confusion, axis1=-2, axis2=-1).astype(np.float64)
+    predicted = confusion.sum(axis=-2)
+    actual = confusion.sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(actual > 0, tp / actual, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    return precision, recall, f1
+
+
+def evaluate_predictions(y_test, y_pred, names=None, labels=None, n_boot=1000, confidence=0.95, random_state=0,
+                         chunk_rows=1 << 20):
+    """Confusion matrices, per-class metrics and bootstrap intervals for many models at once.
+
+    ``y_pred`` is an ``(n_models, n_samples)`` matrix of predicted labels (or
+    a sequence of prediction vectors). Labels are encoded once and every
+    model's confusion matrix comes from one ``bincount`` per chunk of
+    ``chunk_rows`` samples, so memory stays bounded for millions of rows.
+
+    Resampling test rows with replacement only changes how often each
+    (true, predicted) pair occurs, so each model's bootstrap replicates are
+    drawn as multinomial counts over its confusion matrix; the cost depends
+    on the number of classes, not on the number of rows.
+
+    ``labels`` fixes the classes and their order in the output; samples whose
+    true or predicted label is not listed are left out, as with
+    ``confusion_matrix(labels=...)``.
+
+    Returns a dict with ``classes``, ``confusion`` (n_models x K x K, rows
+    are true labels), ``summary`` (accuracy and macro F1 with their
+    ``confidence`` intervals, one row per model) and ``per_class``
+    (precision, recall, F1 and support indexed by model and class).
+    """
+    y_test = np.asarray(y_test)
+    y_pred = np.asarray(y_pred)
+    if y_pred.ndim == 1:
+        y_pred = y_pred[None, :]
+    n_models, n_samples = y_pred.shape
+    if len(y_test) != n_samples:
+        raise ValueError(f"y_pred has {n_samples} samples per model but y_test has {len(y_test)}")
+    names = list(range(n_models)) if names is None else list(names)
+    classes = np.unique(np.concatenate([np.unique(y_test), np.unique(y_pred)])) if labels is None \
+        else np.asarray(labels)
+    n_classes = len(classes)
+    order = np.argsort(classes, kind='stable')
+    sorted_classes = classes[order]
+    if n_classes and np.any(sorted_classes[1:] == sorted_classes[:-1]):
+        raise ValueError("labels must be unique")
+
+    def encode(values):
+        """Position of every value in ``classes``, or ``n_classes`` when it is not listed."""
+        position = np.clip(np.searchsorted(sorted_classes, values), 0, max(n_classes - 1, 0))
+        return np.where(sorted_classes[position] == values, order[position], n_classes) if n_classes \
+            else np.zeros(np.shape(values), dtype=np.intp)
+
+    with stage('evaluate_predictions', y_pred, models=n_models, classes=n_classes):
+        # Samples whose true or predicted label is not in ``labels`` go to one extra
+        # bin that is dropped, as confusion_matrix(labels=...) ignores them
+        cells = n_models * n_classes * n_classes
+        confusion = np.zeros(cells + 1, dtype=np.int64)
+        offsets = (np.arange(n_models) * n_classes * n_classes)[:, None]
+        for start in range(0, n_samples, chunk_rows):
+            true = encode(y_test[start:start + chunk_rows])
+            pred = encode(y_pred[:, start:start + chunk_rows])
+            index = np.where((true < n_classes) & (pred < n_classes), offsets + true * n_classes + pred, cells)
+            confusion += np.bincount(index.ravel(), minlength=cells + 1)
+        confusion = confusion[:cells].reshape(n_models, n_classes, n_classes)
+        counted = confusion.sum(axis=(1, 2))
+
+        precision, recall, f1 = _f1(confusion)
+        accuracy = np.trace(confusion, axis1=1, axis2=2) / np.maximum(counted, 1)
+        macro_f1 = f1.mean(axis=1)
+
+        alpha = (1 - confidence) / 2
+        rng = np.random.default_rng(random_state)
+        bounds = np.empty((n_models, 4))
+        for model in range(n_models):
+            n = max(counted[model], 1)
+            boot = rng.multinomial(counted[model], confusion[model].ravel() / n, size=n_boot)
+            boot = boot.reshape(n_boot, n_classes, n_classes)
+            boot_accuracy = np.trace(boot, axis1=1, axis2=2) / n
+            boot_f1 = _f1(boot)[2].mean(axis=1)
+            bounds[model] = np.concatenate([np.quantile(boot_accuracy, [alpha, 1 - alpha]),
+                                            np.quantile(boot_f1, [alpha, 1 - alpha])])
+
+    summary = pd.DataFrame({
+        'accuracy': accuracy,
+        'accuracy_low': bounds[:, 0],
+        'accuracy_high': bounds[:, 1],
+        'macro_f1': macro_f1,
+        'macro_f1_low': bounds[:, 2],
+        'macro_f1_high': bounds[:, 3],
+    }, index=pd.Index(names, name='model'))
+    per_class = pd.DataFrame({
+        'precision': precision.ravel(),
+        'recall': recall.ravel(),
+        'f1': f1.ravel(),
+        'support': confusion.sum(axis=2).ravel(),
+    }, index=pd.MultiIndex.from_product([names, classes], names=['model', 'class']))
+    return {'classes': classes, 'confusion': confusion, 'summary': summary, 'per_class': per_class}
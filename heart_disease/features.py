@@ -0,0 +1,104 @@
+"""Memory-mapped float32 feature store for the preprocessed arrhythmia matrix.
+
+``FeatureStore.write`` splits the rows into train and test (stratified, as
+``preprocessing.split_arrhythmia`` does) and writes the matrix once, as a
+C-contiguous float32 ``.npy`` file in the ``cache`` layout, with the training
+rows first. ``X_train`` and ``X_test`` are then plain slices of one memory
+map: no split, PCA input or feature selector needs a copy of its own, and
+threads reading them share the same page-cache pages.
+
+A store pickles as its path, so process workers reopen the file instead of
+receiving the matrix through a pipe.
+"""
+import os
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from . import cache
+from .tracing import stage
+
+_STATS = ('columns', 'fill', 'mean', 'scale')
+
+
+class FeatureStore:
+    """Train/test views over one on-disk float32 feature matrix."""
+
+    def __init__(self, path, X, y, ids, n_train, feature_names, preprocessing=None):
+        self.path = path
+        self.X = X
+        self.y = y
+        self.ids = ids
+        self.n_train = int(n_train)
+        self.feature_names = np.asarray(feature_names)
+        self.preprocessing = preprocessing
+
+    @classmethod
+    def write(cls, path, X, y, test_size=0.3, random_state=43, chunk_rows=4096):
+        """Split ``X``/``y`` and write them to directory ``path``; returns the opened store.
+
+        ``ids`` keeps each stored row's position in ``X``, and the
+        ``attrs['preprocessing']`` statistics of a ``preprocess_arrhythmia``
+        frame are stored alongside.
+        """
+        path = os.path.abspath(path)
+        name, cache_dir = os.path.basename(path), os.path.dirname(path)
+        feature_names = getattr(X, 'columns', None)
+        feature_names = np.arange(X.shape[1]) if feature_names is None else np.asarray(feature_names)
+        stats = getattr(X, 'attrs', {}).get('preprocessing')
+        values = np.asarray(X)
+        y = np.asarray(y)
+
+        with stage('feature_store', values, path=path):
+            train, test = train_test_split(np.arange(len(values)), test_size=test_size, shuffle=True,
+                                           stratify=y, random_state=random_state)
+            order = np.concatenate([train, test])
+            matrix = cache.allocate(name, 'X', values.shape, np.float32, cache_dir)
+            for start in range(0, len(order), chunk_rows):
+                rows = order[start:start + chunk_rows]
+                matrix[start:start + len(rows)] = values[rows]
+            arrays = {'X': matrix, 'y': y[order], 'ids': order.astype(np.intp), 'feature_names': feature_names}
+            if stats is not None:
+                arrays.update({'stat_' + key: np.asarray(stats[key]) for key in _STATS})
+            cache.store(name, arrays, {'n_train': len(train), 'stats': stats is not None}, cache_dir)
+            del matrix
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path, mmap_mode='r'):
+        path = os.path.abspath(path)
+        arrays, manifest = cache.load(os.path.basename(path), os.path.dirname(path), mmap_mode=mmap_mode)
+        stats = {key: arrays['stat_' + key] for key in _STATS} if manifest['stats'] else None
+        return cls(path, arrays['X'], arrays['y'], arrays['ids'], manifest['n_train'],
+                   arrays['feature_names'], stats)
+
+    def __reduce__(self):
+        return (FeatureStore.open, (self.path,))
+
+    @property
+    def X_train(self):
+        return self.X[:self.n_train]
+
+    @property
+    def X_test(self):
+        return self.X[self.n_train:]
+
+    @property
+    def y_train(self):
+        return self.y[:self.n_train]
+
+    @property
+    def y_test(self):
+        return self.y[self.n_train:]
+
+    @property
+    def train_ids(self):
+        return self.ids[:self.n_train]
+
+    @property
+    def test_ids(self):
+        return self.ids[self.n_train:]
+
+    def split(self):
+        """``(X_train, X_test, y_train, y_test)`` views, in ``split_arrhythmia`` order."""
+        return self.X_train, self.X_test, self.y_train, self.y_test
@@ -0,0 +1,144 @@
+"""Map the heart disease CSVs onto one canonical schema and cache the result.
+
+The repository ships two versions of the Cleveland data that encode it
+differently. ``heart_cleveland_upload.csv`` is the canonical form
+(``CLEVELAND_SCHEMA``, target ``condition``). ``heart (1).csv`` starts with a
+UTF-8 BOM, names the target ``target`` with the opposite meaning (1 = no
+disease), orders the ``cp``, ``thal``, ``slope`` and ``restecg`` codes
+differently, and marks missing ``thal``/``ca`` values with the out-of-range
+codes 0 and 4. Matching its rows against the upload on the vitals gives the
+lookup tables in ``SOURCES``; codes a table does not map are missing, and
+rows with missing values are dropped, as they were for the upload.
+
+Further sources are added as ``SOURCES`` entries. ``load_harmonized`` reads,
+recodes, validates and concatenates them and stores the combined frame in the
+dataset cache as one memory-mapped ``.npy`` file per column. The entry is
+rebuilt when a source's size or modification time changes; otherwise loads
+skip parsing entirely.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import cache
+from .data import CLEVELAND_CSV, CLEVELAND_SCHEMA, DATA_DIR, _validate_chunk
+from .tracing import stage
+
+HEART_CSV = os.path.join(DATA_DIR, "heart (1).csv")
+
+# Source name -> path, {source column: canonical column}, and per canonical
+# column {source code: canonical code}. Columns without a table are copied.
+SOURCES = {
+    'cleveland': {
+        'path': CLEVELAND_CSV,
+        'rename': {},
+        'recode': {},
+    },
+    'heart': {
+        'path': HEART_CSV,
+        'rename': {'target': 'condition'},
+        'recode': {
+            'cp': {0: 3, 1: 1, 2: 2, 3: 0},
+            'restecg': {0: 2, 1: 0, 2: 1},
+            'slope': {0: 2, 1: 1, 2: 0},
+            'ca': {0: 0, 1: 1, 2: 2, 3: 3},
+            'thal': {1: 1, 2: 0, 3: 2},
+            'condition': {0: 1, 1: 0},
+        },
+    },
+}
+
+
+def _lookup_table(mapping):
+    """Dense array ``table[source code] = canonical code``, -1 where unmapped."""
+    table = np.full(max(mapping) + 1, -1, dtype=np.int32)
+    table[list(mapping)] = list(mapping.values())
+    return table
+
+
+def recode(frame, spec):
+    """Rename ``frame``'s columns and recode its categories per source ``spec``, in one lookup per column.
+
+    Codes the tables do not map become ``-1`` in integer columns and NaN in
+    float columns.
+    """
+    frame = frame.rename(columns=spec['rename'])
+    for column, mapping in spec['recode'].items():
+        if column not in frame:
+            continue
+        values = frame[column].to_numpy()
+        table = _lookup_table(mapping)
+        codes = np.nan_to_num(values, nan=-1).astype(np.int64)
+        in_range = (codes >= 0) & (codes < len(table)) & (codes == values)
+        recoded = np.where(in_range, table[np.clip(codes, 0, len(table) - 1)], -1)
+        if values.dtype.kind == 'f':
+            frame[column] = np.where(recoded < 0, np.nan, recoded)
+        else:
+            frame[column] = recoded.astype(values.dtype)
+    return frame
+
+
+def read_source(name, schema=CLEVELAND_SCHEMA, chunksize=100000):
+    """One source as a canonical-schema frame; rows with unmapped codes are dropped."""
+    spec = SOURCES[name]
+    inverse = {canonical: column for column, canonical in spec['rename'].items()}
+    parse_dtypes = {inverse.get(column, column): 'int32' if dtype.startswith('int') else dtype
+                    for column, (dtype, _, _) in schema.items()}
+    store_dtypes = {column: dtype for column, (dtype, _, _) in schema.items()}
+
+    chunks = []
+    for chunk in pd.read_csv(spec['path'], usecols=[inverse.get(c, c) for c in schema], dtype=parse_dtypes,
+                             chunksize=chunksize, encoding='utf-8-sig'):
+        chunk = recode(chunk, spec)[list(schema)]
+        valid = np.ones(len(chunk), dtype=bool)
+        for column in spec['recode']:
+            valid &= chunk[column].to_numpy() >= 0
+        chunk = chunk[valid]
+        _validate_chunk(chunk, schema, spec['path'])
+        chunks.append(chunk.astype(store_dtypes))
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _fingerprint(names, schema, dedupe):
+    """Cache key from every source's spec, size and mtime; changes whenever a file is rewritten."""
+    h = hashlib.sha256(json.dumps([names, sorted(schema.items()), dedupe], default=str).encode())
+    for name in names:
+        stat = os.stat(SOURCES[name]['path'])
+        h.update(json.dumps([SOURCES[name], stat.st_size, stat.st_mtime_ns], sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def load_harmonized(names=('cleveland', 'heart'), schema=CLEVELAND_SCHEMA, dedupe=True, cache_dir=None):
+    """The listed sources as one canonical-schema frame, from the columnar cache when current.
+
+    A ``source`` column holds each row's position in ``names``. With
+    ``dedupe=True`` a patient present in several sources is kept once, from
+    the first source listing it.
+    """
+    names = list(names)
+    fingerprint = _fingerprint(names, schema, dedupe)
+    entry = 'harmonized-' + '+'.join(names) + ('' if dedupe else '-all')
+    manifest = cache.read_manifest(entry, cache_dir)
+
+    if manifest is None or manifest.get('fingerprint') != fingerprint:
+        with stage('harmonize', sources=names):
+            frames = []
+            for code, name in enumerate(names):
+                frame = read_source(name, schema)
+                frame['source'] = np.int8(code)
+                frames.append(frame)
+            combined = pd.concat(frames, ignore_index=True)
+            if dedupe:
+                combined = combined[~combined.duplicated(subset=list(schema))].reset_index(drop=True)
+            arrays = {column: combined[column].to_numpy() for column in combined.columns}
+            cache.store(entry, arrays, {'fingerprint': fingerprint, 'sources': names,
+                                        'columns': list(combined.columns)}, cache_dir)
+
+    with stage('load_harmonized', sources=names) as span:
+        arrays, manifest = cache.load(entry, cache_dir)
+        frame = pd.DataFrame({column: arrays[column] for column in manifest['columns']}, copy=False)
+        frame.attrs['sources'] = manifest['sources']
+        return span.output(frame)
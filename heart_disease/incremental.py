@@ -0,0 +1,134 @@
+"""Out-of-core training on Cleveland-schema CSVs of any size.
+
+The CSV is streamed in chunks with ``data.iter_cleveland``, so memory is
+bounded by the chunk size rather than the registry size. A first pass fits a
+running ``StandardScaler`` with ``partial_fit``; each following epoch streams
+the file again and updates every model with ``partial_fit`` on the scaled
+chunk. Rows are split into train and holdout by a hash of their position in
+the file, so the split does not depend on the chunk size and the holdout can
+be scored in a final streaming pass.
+
+With ``checkpoint=path`` the scaler, the models and the position reached are
+written (atomically) after every ``checkpoint_every`` chunks, and a later call
+with the same path resumes from there instead of starting over.
+"""
+import os
+
+import joblib
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import GaussianNB
+from sklearn.preprocessing import StandardScaler
+
+from .data import CLEVELAND_CSV, CLEVELAND_SCHEMA, iter_cleveland
+from .evaluation import score_predictions
+from .tracing import stage
+
+
+def incremental_models(random_state=0):
+    """The unfitted ``partial_fit`` classifiers trained out of core."""
+    return {
+        'SGD_LR_model': SGDClassifier(loss='log_loss', random_state=random_state),
+        'NB_model': GaussianNB(),
+        'SGD_SVM_model': SGDClassifier(loss='hinge', random_state=random_state),
+    }
+
+
+def holdout_mask(start, n_rows, test_size=0.25):
+    """True for the rows ``start .. start + n_rows`` of the file that are held out."""
+    rows = np.arange(start, start + n_rows, dtype=np.uint64)
+    # Fibonacci hashing spreads consecutive rows evenly over [0, 1)
+    with np.errstate(over='ignore'):
+        hashed = rows * np.uint64(0x9E3779B97F4A7C15)
+    return (hashed >> np.uint64(11)).astype(np.float64) / 2.0 ** 53 < test_size
+
+
+def _chunks(path, target, chunksize, schema):
+    """``(index, start row, X, y)`` for every chunk of the CSV."""
+    start = 0
+    for index, chunk in enumerate(iter_cleveland(path, schema, chunksize)):
+        y = chunk[target].to_numpy()
+        X = chunk.drop(columns=target).to_numpy(dtype=np.float64)
+        yield index, start, X, y
+        start += len(chunk)
+
+
+def _save_checkpoint(path, state):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    joblib.dump(state, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def train_incremental(path=CLEVELAND_CSV, models=None, target='condition', chunksize=100000, epochs=1,
+                      test_size=0.25, checkpoint=None, checkpoint_every=1, random_state=0,
+                      schema=CLEVELAND_SCHEMA):
+    """Fit a scaler and ``partial_fit`` models on the training rows of ``path``.
+
+    Returns ``(models, scaler)``. Rows within a chunk are shuffled before
+    every update, with a seed derived from ``random_state``, the epoch and the
+    chunk, so resumed and uninterrupted runs reach the same models.
+    """
+    if checkpoint is not None and os.path.exists(checkpoint):
+        state = joblib.load(checkpoint)
+    else:
+        state = {'scaler': StandardScaler(), 'models': models if models is not None else incremental_models(),
+                 'scaled': False, 'epoch': 0, 'chunk': 0}
+    scaler, models = state['scaler'], state['models']
+    _, low, high = schema[target]
+    classes = np.arange(low, high + 1)
+
+    def done(index):
+        state['chunk'] = index + 1
+        if checkpoint is not None and state['chunk'] % checkpoint_every == 0:
+            _save_checkpoint(checkpoint, state)
+
+    if not state['scaled']:
+        with stage('incremental_scaler', path=str(path)):
+            for index, start, X, _ in _chunks(path, target, chunksize, schema):
+                if index < state['chunk']:
+                    continue
+                train = ~holdout_mask(start, len(X), test_size)
+                if train.any():
+                    scaler.partial_fit(X[train])
+                done(index)
+        state.update(scaled=True, chunk=0)
+
+    while state['epoch'] < epochs:
+        with stage('incremental_epoch', path=str(path), epoch=state['epoch']):
+            for index, start, X, y in _chunks(path, target, chunksize, schema):
+                if index < state['chunk']:
+                    continue
+                train = ~holdout_mask(start, len(X), test_size)
+                rng = np.random.default_rng([random_state, state['epoch'], index])
+                order = rng.permutation(np.flatnonzero(train))
+                if len(order):
+                    X_train = scaler.transform(X[order])
+                    for name, model in models.items():
+                        with stage('partial_fit', X_train, model=name):
+                            model.partial_fit(X_train, y[order], classes=classes)
+                done(index)
+        state.update(epoch=state['epoch'] + 1, chunk=0)
+        if checkpoint is not None:
+            _save_checkpoint(checkpoint, state)
+    return models, scaler
+
+
+def evaluate_incremental(models, scaler, path=CLEVELAND_CSV, target='condition', chunksize=100000,
+                         test_size=0.25, schema=CLEVELAND_SCHEMA):
+    """``score_model``-style results for every model on the holdout rows of ``path``.
+
+    Only the holdout labels and predictions (one byte per row each for the
+    Cleveland codes) are kept while streaming.
+    """
+    y_true, y_pred = [], {name: [] for name in models}
+    with stage('incremental_evaluate', path=str(path)):
+        for _, start, X, y in _chunks(path, target, chunksize, schema):
+            test = holdout_mask(start, len(X), test_size)
+            if not test.any():
+                continue
+            X_test = scaler.transform(X[test])
+            y_true.append(y[test])
+            for name, model in models.items():
+                y_pred[name].append(model.predict(X_test).astype(y.dtype))
+    y_true = np.concatenate(y_true)
+    return {name: score_predictions(y_true, np.concatenate(pred)) for name, pred in y_pred.items()}
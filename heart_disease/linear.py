@@ -0,0 +1,136 @@
+"""Dependency-free scorers for linear models with their preprocessing folded in.
+
+Standardizing, projecting onto principal components and applying a linear
+model are all affine, so
+
+    ((x - mean) / scale - pca_mean) @ components.T @ coef.T + intercept
+
+collapses into one ``x @ weights + bias``. ``compile_linear`` precomputes
+``weights`` and ``bias`` from a fitted ``LogisticRegression``, linear
+``SVC`` or any other ``coef_``/``intercept_`` classifier, an optional
+``StandardScaler`` (or plain ``mean``/``scale`` vectors) and an optional
+``PCA``. ``LinearScorer`` then needs one matrix multiply per batch and only
+NumPy: binary and one-vs-rest models threshold or take the argmax of the
+decision values, and multiclass ``SVC`` models vote over their one-vs-one
+pairs as libsvm does. Raw inputs can also be narrowed to the columns the
+preprocessing kept and have missing values filled first.
+"""
+import joblib
+import numpy as np
+
+_ARRAYS = ('weights', 'bias', 'classes', 'columns', 'fill')
+
+
+def compile_linear(model, scaler=None, pca=None, mean=None, scale=None, columns=None, fill=None):
+    """Fold ``scaler``/``mean``/``scale``, ``pca`` and ``model`` into a ``LinearScorer``.
+
+    ``columns`` selects the raw input columns the scaler was fitted on and
+    ``fill`` gives a value per selected column for NaN entries (e.g. the
+    imputation medians).
+    """
+    coef = np.asarray(model.coef_, dtype=np.float64)
+    intercept = np.asarray(model.intercept_, dtype=np.float64)
+    if hasattr(model, 'kernel') and model.kernel != 'linear':
+        raise ValueError(f"only linear kernels can be folded, got kernel={model.kernel!r}")
+
+    # Work backwards from the model: the map from PCA space, then from scaled space
+    weights, bias = coef.T, intercept
+    if pca is not None:
+        components = np.asarray(pca.components_, dtype=np.float64)
+        if getattr(pca, 'whiten', False):
+            components = components / np.sqrt(pca.explained_variance_)[:, None]
+        bias = bias - np.asarray(pca.mean_, dtype=np.float64) @ components.T @ weights
+        weights = components.T @ weights
+    if scaler is not None:
+        mean, scale = scaler.mean_, scaler.scale_
+    if mean is not None:
+        scale = np.asarray(scale, dtype=np.float64)
+        weights = weights / scale[:, None]
+        bias = bias - np.asarray(mean, dtype=np.float64) @ weights
+
+    # libsvm models (SVC, NuSVC) keep one coefficient row per pair of classes and vote;
+    # with three classes that has the same shape as one-vs-rest, so go by the model
+    n_classes = len(model.classes_)
+    if hasattr(model, 'dual_coef_') and n_classes > 2:
+        kind = 'ovo'
+    elif coef.shape[0] == 1:
+        kind = 'binary'
+    else:
+        kind = 'ovr'
+    proba = 'logistic' if type(model).__name__ == 'LogisticRegression' else None
+    arrays = {
+        'weights': np.ascontiguousarray(weights),
+        'bias': np.asarray(bias, dtype=np.float64),
+        'classes': np.asarray(model.classes_),
+        'columns': None if columns is None else np.asarray(columns, dtype=np.intp),
+        'fill': None if fill is None else np.asarray(fill, dtype=np.float64),
+    }
+    return LinearScorer(arrays, kind, proba)
+
+
+class LinearScorer:
+    """``predict``/``decision_function`` (and ``predict_proba`` for logistic models) in one matmul."""
+
+    def __init__(self, arrays, kind, proba=None):
+        for name in _ARRAYS:
+            value = arrays.get(name)
+            setattr(self, name, None if value is None else np.asarray(value))
+        self.kind = kind
+        self.proba = proba
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for name in _ARRAYS:
+            value = getattr(self, name)
+            if value is not None:
+                setattr(self, name, np.asarray(value))
+
+    @property
+    def classes_(self):
+        return self.classes
+
+    def save(self, path):
+        joblib.dump({'arrays': {name: getattr(self, name) for name in _ARRAYS},
+                     'kind': self.kind, 'proba': self.proba}, path)
+        return path
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        state = joblib.load(path, mmap_mode=mmap_mode)
+        return cls(state['arrays'], state['kind'], state['proba'])
+
+    def decision_function(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if self.columns is not None:
+            X = X[:, self.columns]
+        if self.fill is not None:
+            X = np.where(np.isnan(X), self.fill, X)
+        decision = X @ self.weights + self.bias
+        return decision[:, 0] if self.kind == 'binary' else decision
+
+    def predict(self, X):
+        decision = self.decision_function(X)
+        if self.kind == 'binary':
+            return self.classes.take((decision > 0).astype(np.intp))
+        if self.kind == 'ovr':
+            return self.classes.take(np.argmax(decision, axis=1))
+        # One-vs-one: pair (i, j) votes for i when its decision value is positive
+        n_classes = len(self.classes)
+        first, second = np.triu_indices(n_classes, k=1)
+        winner = np.where(decision > 0, first, second)
+        votes = np.zeros((len(decision), n_classes), dtype=np.intp)
+        np.add.at(votes, (np.arange(len(decision))[:, None], winner), 1)
+        return self.classes.take(np.argmax(votes, axis=1))
+
+    def predict_proba(self, X):
+        if self.proba != 'logistic':
+            raise AttributeError("predict_proba is only available for logistic regression models")
+        decision = self.decision_function(X)
+        if self.kind == 'binary':
+            positive = 1.0 / (1.0 + np.exp(-decision))
+            return np.column_stack([1.0 - positive, positive])
+        decision = decision - decision.max(axis=1, keepdims=True)
+        exp = np.exp(decision)
+        return exp / exp.sum(axis=1, keepdims=True)
@@ -0,0 +1,147 @@
+"""Model construction and training for both studies."""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_selection import SelectFromModel
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.metrics.pairwise import pairwise_kernels
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.svm import SVC
+from sklearn.tree import DecisionTreeClassifier
+
+from . import memo
+from .tracing import stage
+
+C_LIST = [0.001, 0.01, 0.1, 1, 10, 100, 1000]
+KERNELS = ['linear', 'rbf', 'poly', 'sigmoid']
+
+# Parameters each kernel takes from svm_kernel_params
+KERNEL_PARAMS = {
+    'linear': (),
+    'rbf': ('gamma',),
+    'poly': ('gamma', 'degree', 'coef0'),
+    'sigmoid': ('gamma', 'coef0'),
+}
+
+
+def cleveland_models():
+    """The five unfitted classifiers compared on the Cleveland data."""
+    return {
+        'LR_model': LogisticRegression(),
+        'Knn_model': KNeighborsClassifier(n_neighbors=5, metric='minkowski', p=2),
+        'SVC_model': SVC(),
+        'RF_model': RandomForestClassifier(n_estimators=20),
+        'DT_model': DecisionTreeClassifier(),
+    }
+
+
+def train_models(models, x_train, y_train):
+    """Fit every model in ``models`` in place and return the dict."""
+    for name, model in models.items():
+        with stage('fit', x_train, model=name):
+            model.fit(x_train, y_train)
+    return models
+
+
+def rf_feature_selector(X_train, Y_train, n_estimators=20, random_state=0):
+    """Fit a ``SelectFromModel`` selector backed by a random forest.
+
+    The fitted forest stays available as ``estimator_`` (with its
+    ``feature_importances_``), so it can score the same data as a classifier
+    without a second fit.
+    """
+    rfc = SelectFromModel(RandomForestClassifier(n_estimators=n_estimators, random_state=random_state, n_jobs=-1))
+    with stage('select_from_model', X_train) as span:
+        rfc = memo.fit(rfc, X_train, Y_train)
+        span.set(selected=int(rfc.get_support().sum()))
+    return rfc
+
+
+def svm_kernel_params(X_train):
+    """The ``SVC`` defaults for gamma (``'scale'``), degree and coef0 on ``X_train``."""
+    X_train = np.asarray(X_train, dtype=float)
+    return {'gamma': 1.0 / (X_train.shape[1] * X_train.var()), 'degree': 3, 'coef0': 0.0}
+
+
+def _gram(kernel, X_train, X_test, params):
+    kwds = {name: params[name] for name in KERNEL_PARAMS[kernel]}
+    return (pairwise_kernels(X_train, metric=kernel, **kwds),
+            pairwise_kernels(X_test, X_train, metric=kernel, **kwds))
+
+
+def _fit_cell(kernel, cval, K_train, K_test, Y_train, Y_test, max_iter):
+    clf = SVC(max_iter=max_iter, kernel='precomputed', C=cval)
+    with stage('fit', K_train, model='SVC', kernel=kernel, C=cval):
+        start = time.perf_counter()
+        clf.fit(K_train, Y_train)
+        fit_time = time.perf_counter() - start
+    with stage('predict', K_test, model='SVC', kernel=kernel, C=cval) as span:
+        y_pred = span.output(clf.predict(K_test))
+    n_iter = int(clf.n_iter_.max())
+    return {
+        'kernel': kernel,
+        'C': cval,
+        'accuracy': accuracy_score(Y_test, y_pred),
+        'fit_time': fit_time,
+        'n_iter': n_iter,
+        'converged': n_iter < max_iter,
+        'y_pred': y_pred,
+    }
+
+
+def svm_grid(X_train, Y_train, X_test, Y_test, kernels=KERNELS, c_list=C_LIST, max_iter=100000, max_workers=None,
+             columns=None):
+    """Fit ``SVC`` for every kernel and C value and score it on the test set.
+
+    Each kernel's Gram matrices (train x train and test x train) are computed
+    once and shared by all of its C values through ``kernel='precomputed'``,
+    with the same gamma/degree/coef0 that ``SVC`` would use. Grid cells run in
+    a thread pool; libsvm releases the GIL while fitting, so the threads use
+    separate cores without copying the kernel matrices.
+
+    Returns a DataFrame with one row per cell: ``kernel``, ``C``, ``accuracy``,
+    ``fit_time``, ``n_iter`` (largest iteration count over the one-vs-one
+    problems), ``converged`` (False when a problem stopped at ``max_iter``) and
+    the test predictions ``y_pred``.
+
+    ``columns`` restricts both matrices to a feature subset (e.g. the
+    ``get_support`` of a feature selector). The subset is gathered by the same
+    float64 conversion libsvm needs anyway, so callers pass the full
+    (possibly memory-mapped float32) matrices instead of transformed copies.
+    """
+    if columns is not None:
+        columns = np.asarray(columns)
+        columns = np.flatnonzero(columns) if columns.dtype == bool else columns
+        X_train = np.take(X_train, columns, axis=1).astype(float, copy=False)
+        X_test = np.take(X_test, columns, axis=1).astype(float, copy=False)
+    X_train = np.asarray(X_train, dtype=float)
+    X_test = np.asarray(X_test, dtype=float)
+    Y_train = np.asarray(Y_train)
+    Y_test = np.asarray(Y_test)
+    params = svm_kernel_params(X_train)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        with stage('gram_matrices', X_train, kernels=list(kernels)):
+            grams = dict(zip(kernels, pool.map(lambda kernel: _gram(kernel, X_train, X_test, params), kernels)))
+        futures = [pool.submit(_fit_cell, kernel, cval, *grams[kernel], Y_train, Y_test, max_iter)
+                   for kernel in kernels for cval in c_list]
+        rows = [future.result() for future in futures]
+    return pd.DataFrame(rows)
+
+
+def grid_accuracy(grid):
+    """Map each kernel of an ``svm_grid`` table to its accuracies in C order."""
+    return {kernel: cells['accuracy'].tolist() for kernel, cells in grid.groupby('kernel', sort=False)}
+
+
+def best_c(accuracy, c_list=C_LIST):
+    """Map each kernel to ``(best accuracy, C value achieving it)``."""
+    best = {}
+    for kernel, scores in accuracy.items():
+        top = max(scores)
+        best[kernel] = (top, c_list[scores.index(top)])
+    return best
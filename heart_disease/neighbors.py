@@ -0,0 +1,220 @@
+"""Persistent, memory-mappable k-nearest-neighbour index.
+
+``NeighborIndex.build`` partitions the scaled reference rows into k-means
+cells and stores them cell by cell, with every cell's centroid and radius, so
+the index is a one-level ball tree. ``save`` writes it as an on-disk entry in
+the ``cache`` layout and ``load`` memory-maps it back, so the reference set is
+never refit or copied.
+
+Queries are answered a batch at a time, one sweep over the cells serving
+every query that needs the cell. All queries first search their nearest cell;
+then
+
+* exact search (``n_probe=None``) visits every other cell whose lower bound
+  ``|q - centroid| - radius`` is within the current k-th neighbour distance,
+  and returns the same neighbours as brute force;
+* approximate search visits only the ``n_probe`` cells with the nearest
+  centroids (and further cells in the same order while fewer than ``k``
+  rows have been seen), trading recall for speed (``recall`` measures it
+  against exact search).
+
+``add`` inserts new rows without rebuilding: they are kept in a pending
+buffer that is searched exhaustively, and are folded into their nearest cells
+(growing the radius as needed) once the buffer fills or the index is saved.
+"""
+import os
+
+import numpy as np
+
+from . import cache
+from .tracing import stage
+
+
+def _sq_distances(X, points):
+    """Squared Euclidean distances between the rows of ``X`` and ``points``."""
+    d = (X * X).sum(axis=1)[:, None] - 2.0 * X @ points.T + (points * points).sum(axis=1)[None, :]
+    return np.maximum(d, 0.0, out=d)
+
+
+def _merge(best, new, k):
+    """Keep the ``k`` smallest-distance candidates per row of ``best`` and ``new``.
+
+    Both are ``(distances, ids, labels)`` tuples of equally shaped arrays.
+    """
+    merged = [np.concatenate([a, b], axis=1) for a, b in zip(best, new)]
+    if merged[0].shape[1] > 2 * k:
+        keep = np.argpartition(merged[0], k - 1, axis=1)[:, :k]
+        merged = [np.take_along_axis(a, keep, axis=1) for a in merged]
+    order = np.argsort(merged[0], axis=1, kind='stable')[:, :k]
+    return tuple(np.take_along_axis(a, order, axis=1) for a in merged)
+
+
+class NeighborIndex:
+    """k-NN search and majority-vote classification over a partitioned reference set."""
+
+    def __init__(self, points, labels, ids, centroids, radius, offsets, classes, max_pending=4096):
+        self.points = points
+        self.labels = labels
+        self.ids = ids
+        self.centroids = np.asarray(centroids)
+        self.radius = np.array(radius, dtype=np.float64)
+        self.offsets = np.asarray(offsets)
+        self.classes_ = np.asarray(classes)
+        self.max_pending = max_pending
+        self._pending = []
+
+    @classmethod
+    def build(cls, X, y, n_cells=None, random_state=0, max_pending=4096):
+        """Partition ``X`` (already scaled) into ``n_cells`` cells, ``sqrt(n)`` by default."""
+        from sklearn.cluster import KMeans
+
+        X = np.asarray(X, dtype=np.float64)
+        classes, labels = np.unique(np.asarray(y), return_inverse=True)
+        n_cells = n_cells or max(1, int(np.sqrt(len(X))))
+        with stage('build_neighbor_index', X, cells=n_cells):
+            kmeans = KMeans(n_clusters=n_cells, n_init=1, random_state=random_state).fit(X)
+            cell = kmeans.labels_
+            order = np.argsort(cell, kind='stable')
+            points = np.ascontiguousarray(X[order])
+            centroids = kmeans.cluster_centers_
+            radius = np.zeros(n_cells)
+            np.maximum.at(radius, cell[order],
+                          np.sqrt(((points - centroids[cell[order]]) ** 2).sum(axis=1)))
+            offsets = np.searchsorted(cell[order], np.arange(n_cells + 1))
+        return cls(points, labels[order].astype(np.intp), order.astype(np.intp), centroids, radius, offsets,
+                   classes, max_pending=max_pending)
+
+    def __len__(self):
+        return len(self.points) + sum(len(rows) for rows, _, _ in self._pending)
+
+    def save(self, path):
+        """Fold pending rows into their cells and write the index to directory ``path``."""
+        self.compact()
+        path = os.path.abspath(path)
+        arrays = {
+            'points': np.asarray(self.points),
+            'labels': np.asarray(self.labels),
+            'ids': np.asarray(self.ids),
+            'centroids': self.centroids,
+            'radius': self.radius,
+            'offsets': self.offsets,
+            'classes': self.classes_,
+        }
+        cache.store(os.path.basename(path), arrays, {'max_pending': self.max_pending}, os.path.dirname(path))
+        return path
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        path = os.path.abspath(path)
+        arrays, manifest = cache.load(os.path.basename(path), os.path.dirname(path), mmap_mode=mmap_mode)
+        return cls(arrays['points'], arrays['labels'], arrays['ids'], arrays['centroids'], arrays['radius'],
+                   arrays['offsets'], arrays['classes'], max_pending=manifest['max_pending'])
+
+    def add(self, X, y):
+        """Insert new reference rows; ids continue from the current size of the index."""
+        X = np.asarray(X, dtype=np.float64).reshape(-1, self.points.shape[1])
+        labels = np.searchsorted(self.classes_, np.asarray(y))
+        if np.any(self.classes_.take(labels, mode='clip') != np.asarray(y)):
+            raise ValueError("add() cannot introduce classes the index was built without")
+        ids = np.arange(len(self), len(self) + len(X))
+        self._pending.append((X, labels.astype(np.intp), ids))
+        if sum(len(rows) for rows, _, _ in self._pending) >= self.max_pending:
+            self.compact()
+        return ids
+
+    def compact(self):
+        """Assign pending rows to their nearest cells and rewrite the cell layout in memory."""
+        if not self._pending:
+            return self
+        X = np.concatenate([rows for rows, _, _ in self._pending])
+        labels = np.concatenate([labels for _, labels, _ in self._pending])
+        ids = np.concatenate([ids for _, _, ids in self._pending])
+        d = _sq_distances(X, self.centroids)
+        cell = np.argmin(d, axis=1)
+        np.maximum.at(self.radius, cell, np.sqrt(d[np.arange(len(X)), cell]))
+
+        old_cell = np.repeat(np.arange(len(self.centroids)), np.diff(self.offsets))
+        all_cell = np.concatenate([old_cell, cell])
+        order = np.argsort(all_cell, kind='stable')
+        self.points = np.concatenate([self.points, X])[order]
+        self.labels = np.concatenate([self.labels, labels])[order]
+        self.ids = np.concatenate([self.ids, ids])[order]
+        self.offsets = np.searchsorted(all_cell[order], np.arange(len(self.centroids) + 1))
+        self._pending = []
+        return self
+
+    def _search(self, X, k, n_probe):
+        """Squared distances, ids and class indices of the ``k`` nearest rows."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if k > len(self):
+            raise ValueError(f"n_neighbors={k} exceeds the {len(self)} rows in the index")
+
+        n = len(X)
+        best = (np.full((n, k), np.inf), np.full((n, k), -1, dtype=np.intp), np.zeros((n, k), dtype=np.intp))
+        for rows, labels, ids in self._pending:
+            d = _sq_distances(X, rows)
+            best = _merge(best, (d, np.broadcast_to(ids, d.shape), np.broadcast_to(labels, d.shape)), k)
+
+        centroid_d = np.sqrt(_sq_distances(X, self.centroids))
+        lower = np.maximum(centroid_d - self.radius, 0.0) ** 2
+        rank = np.empty_like(centroid_d, dtype=np.intp)
+        np.put_along_axis(rank, np.argsort(centroid_d, axis=1), np.arange(len(self.centroids)), axis=1)
+        with stage('kneighbors', X, k=k, n_probe=n_probe):
+            # Nearest cell of every query first, so the exact sweep starts from a tight k-th distance
+            best = self._sweep(X, best, k, lambda c: rank[:, c] == 0)
+            if n_probe is None:
+                best = self._sweep(X, best, k, lambda c: (rank[:, c] > 0) & (lower[:, c] <= best[0][:, -1]))
+            else:
+                if n_probe > 1:
+                    best = self._sweep(X, best, k, lambda c: (rank[:, c] > 0) & (rank[:, c] < n_probe))
+                # Queries whose probed cells held fewer than k rows keep probing in rank order
+                next_rank = max(n_probe, 1)
+                short = best[1][:, -1] < 0
+                while short.any() and next_rank < len(self.centroids):
+                    best = self._sweep(X, best, k, lambda c: short & (rank[:, c] == next_rank))
+                    short = best[1][:, -1] < 0
+                    next_rank += 1
+        return best
+
+    def _sweep(self, X, best, k, wants):
+        """Merge every cell's rows into the candidates of the queries ``wants(cell)`` selects."""
+        for c in range(len(self.centroids)):
+            start, stop = self.offsets[c], self.offsets[c + 1]
+            queries = np.flatnonzero(wants(c))
+            if start == stop or not len(queries):
+                continue
+            d = _sq_distances(X[queries], np.asarray(self.points[start:stop]))
+            new = (d, np.broadcast_to(self.ids[start:stop], d.shape), np.broadcast_to(self.labels[start:stop], d.shape))
+            merged = _merge(tuple(a[queries] for a in best), new, k)
+            for a, b in zip(best, merged):
+                a[queries] = b
+        return best
+
+    def kneighbors(self, X, n_neighbors=5, n_probe=None):
+        """Distances and ids of the ``n_neighbors`` nearest reference rows of every row of ``X``.
+
+        ``n_probe=None`` is exact; an integer caps the cells visited per query.
+        """
+        d, ids, _ = self._search(X, n_neighbors, n_probe)
+        return np.sqrt(d), ids
+
+    def predict_proba(self, X, n_neighbors=5, n_probe=None):
+        """Fraction of the neighbours in each class, columns in ``classes_`` order."""
+        _, ids, labels = self._search(X, n_neighbors, n_probe)
+        found = ids >= 0
+        proba = np.zeros((len(labels), len(self.classes_)))
+        np.add.at(proba, (np.arange(len(labels))[:, None], labels), found.astype(np.float64))
+        return proba / np.maximum(found.sum(axis=1, keepdims=True), 1)
+
+    def predict(self, X, n_neighbors=5, n_probe=None):
+        """Majority vote of the neighbours; ties go to the first class, as in sklearn."""
+        return self.classes_.take(np.argmax(self.predict_proba(X, n_neighbors, n_probe), axis=1))
+
+    def recall(self, X, n_neighbors=5, n_probe=1):
+        """Share of the exact neighbours that ``n_probe``-cell search finds."""
+        _, exact = self.kneighbors(X, n_neighbors)
+        _, approx = self.kneighbors(X, n_neighbors, n_probe)
+        hits = sum(len(np.intersect1d(a, b)) for a, b in zip(exact, approx))
+        return hits / exact.size
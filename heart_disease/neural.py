@@ -0,0 +1,181 @@
+"""Keras classifier for the preprocessed arrhythmia features, tuned for CPU-only hosts.
+
+``train_network`` fits a small fully connected network (one hidden layer by
+default, as in the README's ANN) on the scaled features:
+
+* inputs flow through a ``tf.data`` pipeline that converts the float32
+  matrix once, caches the examples after the first epoch, reshuffles them
+  every epoch and prefetches the next batch while the current one trains;
+* TensorFlow's intra-op pool is sized to the CPU count and the inter-op pool
+  kept small, which suits the narrow dense layers better than the defaults
+  on hosts without a GPU;
+* training stops early when the validation loss has not improved for
+  ``patience`` epochs and restores the best weights;
+* the balanced ``preprocessing.class_weights`` are applied per sample;
+* the validation rows are a stratified holdout of the training rows;
+* every epoch's training time and throughput (samples/s) are recorded,
+  excluding the validation pass.
+
+TensorFlow is imported on first use, so the rest of the package does not
+depend on it.
+"""
+import importlib.util
+import os
+import time
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from ._lazy import tensorflow
+from .tracing import stage
+
+
+def available():
+    """True when TensorFlow can be imported."""
+    return importlib.util.find_spec('tensorflow') is not None
+
+
+def configure_cpu(intra_op_threads=None, inter_op_threads=2):
+    """Size TensorFlow's thread pools; returns the ``(intra, inter)`` counts in effect.
+
+    The pools can only be set before TensorFlow runs its first operation;
+    later calls leave the existing settings alone.
+    """
+    tf = tensorflow()
+    intra_op_threads = intra_op_threads or os.cpu_count() or 1
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+    except RuntimeError:
+        pass
+    return (tf.config.threading.get_intra_op_parallelism_threads(),
+            tf.config.threading.get_inter_op_parallelism_threads())
+
+
+def make_dataset(X, labels, batch_size=32, shuffle=False, seed=0, cache=''):
+    """Batched ``tf.data`` pipeline over ``X`` and integer ``labels``.
+
+    ``cache`` is passed to ``Dataset.cache``: ``''`` keeps the examples in
+    memory, a path spills them to disk for matrices larger than RAM.
+    """
+    tf = tensorflow()
+    X = np.asarray(X, dtype=np.float32)
+    dataset = tf.data.Dataset.from_tensor_slices((X, np.asarray(labels, dtype=np.int32))).cache(cache)
+    if shuffle:
+        dataset = dataset.shuffle(len(X), seed=seed, reshuffle_each_iteration=True)
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+def build_network(n_features, n_classes, hidden=(64,), dropout=0.3, learning_rate=1e-3):
+    """Compiled ``Sequential`` model: ReLU ``Dense`` layers with dropout and a softmax output."""
+    tf = tensorflow()
+    layers = [tf.keras.Input(shape=(n_features,))]
+    for units in hidden:
+        layers.append(tf.keras.layers.Dense(units, activation='relu'))
+        if dropout:
+            layers.append(tf.keras.layers.Dropout(dropout))
+    layers.append(tf.keras.layers.Dense(n_classes, activation='softmax'))
+    model = tf.keras.Sequential(layers)
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate), loss='sparse_categorical_crossentropy',
+                  metrics=['accuracy'])
+    return model
+
+
+def _throughput_callback(tf, n_samples, records):
+    class Throughput(tf.keras.callbacks.Callback):
+        def on_epoch_begin(self, epoch, logs=None):
+            self.start = time.perf_counter()
+            self.train_end = None
+
+        def on_test_begin(self, logs=None):
+            # fit runs validation inside the epoch; stop the training clock here
+            if getattr(self, 'train_end', 0) is None:
+                self.train_end = time.perf_counter()
+
+        def on_epoch_end(self, epoch, logs=None):
+            end = time.perf_counter()
+            seconds = (self.train_end or end) - self.start
+            records.append({'epoch': epoch, 'seconds': seconds, 'samples_per_sec': n_samples / seconds,
+                            'epoch_seconds': end - self.start, **(logs or {})})
+
+    return Throughput()
+
+
+def validation_split(labels, validation_size=0.15, random_state=0):
+    """``(train, val)`` row indices with ``validation_size`` of the rows held out, stratified by ``labels``.
+
+    Classes with a single row cannot be split and stay in training; when the
+    holdout is too small to take every remaining class, the split falls back
+    to a plain shuffle.
+    """
+    labels = np.asarray(labels)
+    rows = np.arange(len(labels))
+    n_val = int(round(len(rows) * validation_size))
+    if not n_val:
+        return rows, rows[:0]
+    values, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    single = counts[inverse] < 2
+    try:
+        train, val = train_test_split(rows[~single], test_size=n_val, stratify=labels[~single],
+                                      random_state=random_state)
+    except ValueError:
+        train, val = train_test_split(rows[~single], test_size=n_val, random_state=random_state)
+    return np.sort(np.concatenate([train, rows[single]])), np.sort(val)
+
+
+def train_network(X_train, y_train, class_weight=None, validation_size=0.15, epochs=200, batch_size=32,
+                  patience=20, hidden=(64,), dropout=0.3, learning_rate=1e-3, random_state=0,
+                  intra_op_threads=None, inter_op_threads=2, cache=''):
+    """Fit a ``NetworkClassifier`` on ``X_train``/``y_train``.
+
+    ``validation_size`` of the training rows are held out, stratified by
+    class, for early stopping. ``class_weight`` maps class labels to weights, as returned by
+    ``preprocessing.class_weights``.
+    """
+    tf = tensorflow()
+    configure_cpu(intra_op_threads, inter_op_threads)
+    tf.keras.utils.set_random_seed(random_state)
+
+    classes, labels = np.unique(np.asarray(y_train), return_inverse=True)
+    train, val = validation_split(labels, validation_size, random_state)
+    X_train = np.asarray(X_train, dtype=np.float32)
+
+    train_ds = make_dataset(X_train[train], labels[train], batch_size, shuffle=True, seed=random_state, cache=cache)
+    val_ds = make_dataset(X_train[val], labels[val], batch_size) if len(val) else None
+    if class_weight is not None:
+        class_weight = {index: float(class_weight[label]) for index, label in enumerate(classes.tolist())}
+
+    model = build_network(X_train.shape[1], len(classes), hidden, dropout, learning_rate)
+    throughput = []
+    callbacks = [_throughput_callback(tf, len(train), throughput)]
+    if val_ds is not None:
+        callbacks.append(tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=patience,
+                                                          restore_best_weights=True))
+    with stage('fit', X_train, model='keras') as span:
+        model.fit(train_ds, validation_data=val_ds, epochs=epochs, class_weight=class_weight,
+                  callbacks=callbacks, verbose=0)
+        span.set(epochs=len(throughput),
+                 samples_per_sec=float(np.median([epoch['samples_per_sec'] for epoch in throughput])))
+    return NetworkClassifier(model, classes, throughput, batch_size)
+
+
+class NetworkClassifier:
+    """A fitted Keras network with the sklearn ``predict``/``predict_proba`` interface.
+
+    ``throughput`` holds one record per trained epoch: ``epoch``, the
+    training-only ``seconds`` and ``samples_per_sec``, the ``epoch_seconds``
+    including validation and the Keras metrics.
+    """
+
+    def __init__(self, model, classes, throughput=(), batch_size=32):
+        self.model = model
+        self.classes_ = np.asarray(classes)
+        self.throughput = list(throughput)
+        self.batch_size = batch_size
+
+    def predict_proba(self, X):
+        dataset = make_dataset(X, np.zeros(len(X), dtype=np.int32), self.batch_size).map(lambda x, _: x)
+        return self.model.predict(dataset, verbose=0)
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
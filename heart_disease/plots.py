@@ -0,0 +1,146 @@
+"""Figures from the notebook's EDA and model-selection sections.
+
+Every function builds and returns a matplotlib figure without showing it;
+matplotlib and seaborn are imported on the first call.
+"""
+import numpy as np
+import pandas as pd
+
+from ._lazy import pyplot, seaborn
+
+
+def null_heatmap(heart_df):
+    plt, sns = pyplot(), seaborn()
+    fig = plt.figure()
+    sns.heatmap(heart_df.isnull(), cmap="icefire")
+    plt.title('Null Values Heatmap')
+    return fig
+
+
+def target_pie(heart_df):
+    plt = pyplot()
+    fig = plt.figure()
+    plt.pie(heart_df['target'].value_counts().values, labels=['yes', 'No'], autopct='%1.0f%%')
+    plt.title('Heart Disease')
+    return fig
+
+
+# (column, kind, label, color) for the 4x3 grid of feature distributions.
+# kind is 'kde' (smoothed density), 'dist' (histogram + kde) or 'bar' (value counts).
+DISTRIBUTION_GRID = [
+    ('age', 'kde', ' Age', None),
+    ('sex', 'bar', ' sex', 'lightpink'),
+    ('cp', 'bar', 'pain', None),
+    ('trestbps', 'dist', 'Blood Pressure', 'red'),
+    ('chol', 'kde', 'cholestrol', None),
+    ('fbs', 'bar', 'Blood sugar', 'lightblue'),
+    ('restecg', 'bar', 'Electrocardiographic result', None),
+    ('thalach', 'dist', 'Maximum heart rate', 'red'),
+    ('exang', 'bar', 'Induced engina', 'orange'),
+    ('oldpeak', 'kde', 'Old peak', None),
+    ('slope', 'bar', 'Slope', 'brown'),
+    ('ca', 'bar', 'Major vessels', None),
+]
+
+
+def feature_distributions(heart_df):
+    plt, sns = pyplot(), seaborn()
+    fig = plt.figure(figsize=(16, 16))
+    for position, (column, kind, label, color) in enumerate(DISTRIBUTION_GRID, start=1):
+        plt.subplot(4, 3, position)
+        if kind == 'kde':
+            sns.kdeplot(heart_df[column], fill=True, label=label)
+        elif kind == 'dist':
+            sns.distplot(heart_df[column], color=color, kde=True, label=label)
+        else:
+            heart_df[column].value_counts().plot(kind='bar', label=label, color=color)
+        plt.xlabel(column)
+        plt.legend()
+    return fig
+
+
+def age_by_target(heart_df):
+    plt, sns = pyplot(), seaborn()
+    fig = plt.figure(figsize=(16, 6))
+    plt.subplot(121)
+    sns.distplot(heart_df[heart_df['target'] == 0]["age"], color='green', label='No heart Disease')
+    sns.distplot(heart_df[heart_df['target'] == 1]["age"], color='red', label='Heart Disease')
+    plt.ylabel('Frequency')
+    plt.xlabel('Age')
+    plt.title('Age distribtuion based on heart disease', fontsize=15)
+    plt.legend()
+    return fig
+
+
+def distribution_by_target(heart_df, column):
+    """Side-by-side distributions of ``column`` without and with heart disease."""
+    plt, sns = pyplot(), seaborn()
+    fig, (axis1, axis2) = plt.subplots(1, 2, figsize=(25, 5))
+    ax = sns.distplot(heart_df[heart_df['target'] == 0][column], label='Do not have heart disease', ax=axis1)
+    ax.set(xlabel='People Do Not Have Heart Disease')
+    ax = sns.distplot(heart_df[heart_df['target'] == 1][column], label='Have heart disease', ax=axis2)
+    ax.set(xlabel='People Have Heart Disease')
+    return fig
+
+
+def crosstab_by_target(heart_df, column, title, xlabel, ticklabels=None, rotation=0):
+    """Bar chart of heart disease frequency per value of ``column``."""
+    plt = pyplot()
+    ax = pd.crosstab(heart_df[column], heart_df.target).plot(kind="bar", figsize=(8, 6))
+    plt.title(title)
+    plt.xlabel(xlabel)
+    if ticklabels is None:
+        plt.xticks(rotation=rotation)
+    else:
+        plt.xticks(np.arange(len(ticklabels)), ticklabels, rotation=rotation)
+    plt.ylabel('Frequency')
+    return ax.figure
+
+
+def correlation_heatmap(heart_df):
+    """Annotated correlation matrix of a frame or of a ``summary.CorrelationSummary``."""
+    plt, sns = pyplot(), seaborn()
+    corr = heart_df.corr() if isinstance(heart_df, pd.DataFrame) else heart_df.correlation()
+    fig = plt.figure(figsize=(15, 15))
+    plt.title('Correlation Matrix', size=20)
+    sns.heatmap(corr, annot=True, cmap="Greens")
+    return fig
+
+
+def pca_curves(pca_dict, eigen_dict):
+    """Cumulative variance ratio and eigenvalue against component count."""
+    plt = pyplot()
+    f = plt.figure()
+    f.patch.set_facecolor('white')
+    plt.title('PCA Variance')
+    plt.xlabel('Principal Component Number')
+    plt.ylabel('Variance Ratio')
+    plt.plot(list(pca_dict.keys()), list(pca_dict.values()), 'r')
+
+    g = plt.figure()
+    g.patch.set_facecolor('white')
+    plt.title('PCA Eigen value')
+    plt.xlabel('Principal Component Number')
+    plt.ylabel('Eigen Values')
+    plt.plot(list(eigen_dict.keys()), list(eigen_dict.values()), 'r')
+    return f, g
+
+
+SVM_CURVES = [('linear', 'r', 'Linear'), ('rbf', 'g', 'Radial Basis'),
+              ('poly', 'b', 'Polynomial'), ('sigmoid', 'y', 'Sigmoid')]
+
+
+def svm_accuracy(c_list, accuracy, title='Kernel SVM (Principle Component Analysis)'):
+    """Accuracy against C for each kernel of an ``svm_grid`` result."""
+    plt = pyplot()
+    fig = plt.figure()
+    fig.patch.set_facecolor('white')
+    plt.xscale('log')
+    plt.title(title)
+    plt.xlabel('Critical Factor')
+    plt.ylabel('Model Accuracy')
+    for kernel, color, label in SVM_CURVES:
+        if kernel in accuracy:
+            plt.plot(c_list, accuracy[kernel], color, label=label)
+    plt.legend(bbox_to_anchor=(0., 1.02, 1., .202), loc=10, ncol=4, borderaxespad=0)
+    return fig
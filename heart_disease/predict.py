@@ -0,0 +1,154 @@
+"""Score a CSV of patients with a saved model artifact.
+
+Run with::
+
+    python -m heart_disease.predict cleveland_model.joblib patients.csv --out predictions.csv
+    cat patients.csv | python -m heart_disease.predict cleveland_model.joblib -
+
+The input needs the artifact's feature columns (other columns such as
+``condition`` or ``target`` are ignored; a UTF-8 BOM is fine). Files encoded
+like another ``harmonize.SOURCES`` entry are recoded on the fly with
+``--source``, e.g. ``--source heart`` for ``heart (1).csv``; rows holding a
+code the source does not map (such as its missing ``thal``/``ca`` markers)
+get an empty prediction instead of failing the run. A reader thread parses
+fixed-size chunks into a small bounded queue while the main thread scores the
+previous chunk and appends ``prediction`` and one ``proba_<class>`` column
+per class to the output, so parsing overlaps scoring and memory use does not
+grow with the input. Throughput is reported on stderr when the input is
+exhausted.
+"""
+import argparse
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .harmonize import SOURCES, recode
+from .scoring import Scorer
+from .tracing import stage
+
+_DONE = object()
+
+
+def _put(chunks, item, stop):
+    while not stop.is_set():
+        try:
+            chunks.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _read(source, columns, spec, chunksize, chunks, stop):
+    inverse = {canonical: column for column, canonical in spec['rename'].items()}
+    try:
+        reader = pd.read_csv(source, usecols=[inverse.get(column, column) for column in columns],
+                             dtype=np.float64, chunksize=chunksize, encoding='utf-8-sig')
+        for chunk in reader:
+            X = recode(chunk, spec)[columns].to_numpy()
+            # Codes the source table does not map (e.g. its missing-value markers) became NaN
+            unmapped = np.zeros(len(X), dtype=bool)
+            for j, column in enumerate(columns):
+                if column in spec['recode']:
+                    unmapped |= np.isnan(X[:, j]) & chunk[inverse.get(column, column)].notna().to_numpy()
+            if not _put(chunks, (X, unmapped), stop):
+                return
+    except BaseException as exc:
+        _put(chunks, exc, stop)
+    else:
+        _put(chunks, _DONE, stop)
+
+
+def predict_stream(scorer, source, sink, chunksize=10000, proba=True, queue_size=2, encoding='cleveland'):
+    """Score every row of the CSV ``source`` and write the results to ``sink`` as CSV.
+
+    ``source`` is a path or a binary file object whose codes follow the
+    ``harmonize.SOURCES`` entry ``encoding``. Rows with a code that entry
+    does not map are written with an empty prediction and probabilities.
+    Returns ``(rows, seconds)``.
+    """
+    chunks = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    reader = threading.Thread(target=_read, args=(source, scorer.feature_names, SOURCES[encoding], chunksize,
+                                                  chunks, stop), daemon=True)
+    classes = list(getattr(scorer.model, 'classes_', []))
+    columns = ['prediction'] + ([f'proba_{label}' for label in classes] if proba else [])
+
+    rows = skipped = 0
+    header = True
+    start = time.perf_counter()
+    reader.start()
+    try:
+        with stage('predict_stream', source=str(getattr(source, 'name', source))) as span:
+            while True:
+                item = chunks.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                X, unmapped = item
+                scored = X[~unmapped] if unmapped.any() else X
+                try:
+                    if not len(scored):
+                        # sklearn models reject empty input; nothing to score in this chunk
+                        labels, probabilities = np.empty(0, dtype=object), np.empty((0, len(columns) - 1))
+                    elif proba:
+                        labels, probabilities = scorer.predict_with_proba(scored)
+                    else:
+                        labels, probabilities = scorer.predict_batch(scored), np.empty((len(scored), 0))
+                except ValueError as exc:
+                    raise ValueError(f'in the chunk starting at data row {rows}: {exc}') from None
+                if unmapped.any():
+                    # Unscorable rows keep their place in the output with empty results
+                    full_labels = np.full(len(X), None, dtype=object)
+                    full_labels[~unmapped] = labels
+                    full_proba = np.full((len(X), probabilities.shape[1]), np.nan)
+                    full_proba[~unmapped] = probabilities
+                    labels, probabilities = full_labels, full_proba
+                    skipped += int(unmapped.sum())
+                out = {'prediction': labels}
+                for i, column in enumerate(columns[1:]):
+                    out[column] = probabilities[:, i]
+                pd.DataFrame(out, columns=columns).to_csv(sink, header=header, index=False)
+                header = False
+                rows += len(X)
+            if header:
+                sink.write(','.join(columns) + '\n')
+            span.set(rows=rows, skipped=skipped)
+    finally:
+        stop.set()
+        reader.join()
+    return rows, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('model', help='artifact written by scoring.save_artifact')
+    parser.add_argument('input', nargs='?', default='-', help="CSV to score, '-' for stdin (default)")
+    parser.add_argument('--out', default='-', help="output CSV, '-' for stdout (default)")
+    parser.add_argument('--chunksize', type=int, default=10000, help='rows per chunk (default: %(default)s)')
+    parser.add_argument('--no-proba', action='store_true', help='write only the predicted class')
+    parser.add_argument('--source', default='cleveland', choices=sorted(SOURCES),
+                        help='category encoding of the input (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    scorer = Scorer.load(args.model)
+    source = sys.stdin.buffer if args.input == '-' else args.input
+    sink = sys.stdout if args.out == '-' else open(args.out, 'w', newline='')
+    try:
+        rows, seconds = predict_stream(scorer, source, sink, args.chunksize, proba=not args.no_proba,
+                                       encoding=args.source)
+    except ValueError as exc:
+        parser.exit(1, f'{parser.prog}: error: {exc}\n')
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    print(f'{rows} rows in {seconds:.2f}s ({rows / max(seconds, 1e-9):,.0f} rows/s)', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""Feature preparation for the Cleveland and arrhythmia datasets."""
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import PCA
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from sklearn.utils.class_weight import compute_class_weight
+from sklearn.utils.extmath import randomized_svd
+
+from . import memo
+from .tracing import stage
+
+
+def split_and_scale(heart_df, target='target', test_size=0.25, random_state=42):
+    """Split the Cleveland frame into scaled train/test matrices.
+
+    The scaler is fitted on the training rows only and applied to both sets.
+    Returns ``(x_train_scaler, x_test_scaler, y_train, y_test, scaler)``.
+    """
+    x = heart_df.drop(columns=target)
+    y = heart_df[target]
+    with stage('train_test_split', x) as span:
+        x_train, x_test, y_train, y_test = span.output(
+            train_test_split(x, y, test_size=test_size, random_state=random_state))
+
+    scaler = StandardScaler()
+    with stage('standard_scaler', x_train) as span:
+        x_train_scaler = span.output(scaler.fit_transform(x_train))
+        x_test_scaler = scaler.transform(x_test)
+    return x_train_scaler, x_test_scaler, y_train, y_test, scaler
+
+
+def _row_chunks(data, chunk_rows):
+    """``(features, classes)`` float64/label blocks from a frame, an array or an iterable of either."""
+    if isinstance(data, (pd.DataFrame, np.ndarray)):
+        data = [data]
+    for chunk in data:
+        if isinstance(chunk, pd.DataFrame):
+            features, classes = chunk.iloc[:, :-1].to_numpy(), chunk.iloc[:, -1].to_numpy()
+        else:
+            chunk = np.asarray(chunk)
+            features, classes = chunk[:, :-1], chunk[:, -1]
+        for start in range(0, len(features), chunk_rows):
+            stop = start + chunk_rows
+            yield np.asarray(features[start:stop], dtype=np.float64), classes[start:stop]
+
+
+def preprocess_arrhythmia(data, missing_thresh=0.4, n_rows=None, chunk_rows=4096, dtype=np.float32):
+    """Drop sparse columns, median-impute and standardize the arrhythmia data.
+
+    ``data`` is a frame or array with the class in the last column and NaN for
+    missing values, or an iterable of such chunks, in which case ``n_rows``
+    must give the total row count. ``missing_thresh`` is the fraction of rows
+    that must be present for a column to be kept.
+
+    The features are copied once into a column-major ``dtype`` buffer while
+    per-column present counts and moments are accumulated. Column medians are
+    then taken block by block, the moments after imputation follow from them
+    without another pass, and sparse columns are dropped, imputed and
+    standardized in place (with ``SimpleImputer``/``StandardScaler``
+    semantics). Returns ``(df_data, df_class)``; ``df_data`` wraps the buffer
+    without copying it, and ``df_data.attrs['preprocessing']`` records the
+    kept ``columns``, their ``fill`` medians and the ``mean``/``scale`` used,
+    so raw rows can be transformed the same way later.
+    """
+    if n_rows is None:
+        if not hasattr(data, 'shape'):
+            raise ValueError("n_rows is required when data is an iterable of chunks")
+        n_rows = data.shape[0]
+
+    chunks = _row_chunks(data, chunk_rows)
+    buffer = classes = None
+    count = mean = m2 = None
+    with stage('load_buffer', data) as span:
+        filled = 0
+        for features, labels in chunks:
+            if buffer is None:
+                buffer = np.empty((n_rows, features.shape[1]), dtype=dtype, order='F')
+                classes = np.empty(n_rows, dtype=np.asarray(labels).dtype)
+                count = np.zeros(features.shape[1])
+                mean = np.zeros(features.shape[1])
+                m2 = np.zeros(features.shape[1])
+            rows = slice(filled, filled + len(features))
+            buffer[rows] = features
+            classes[rows] = labels
+            filled += len(features)
+
+            # Moments of the present values, merged into the running ones (Chan et al.)
+            x = buffer[rows].astype(np.float64)
+            present = ~np.isnan(x)
+            n_b = present.sum(axis=0)
+            mean_b = np.where(present, x, 0.0).sum(axis=0) / np.maximum(n_b, 1)
+            m2_b = (np.where(present, x - mean_b, 0.0) ** 2).sum(axis=0)
+            total = count + n_b
+            delta = mean_b - mean
+            mean += delta * np.divide(n_b, total, out=np.zeros_like(mean), where=total > 0)
+            m2 += m2_b + delta ** 2 * np.divide(count * n_b, total, out=np.zeros_like(m2), where=total > 0)
+            count = total
+        if filled != n_rows:
+            raise ValueError(f"expected {n_rows} rows, got {filled}")
+        span.output(buffer)
+
+    keep = np.flatnonzero(count >= n_rows * missing_thresh)
+    with stage('column_medians', buffer, kept=len(keep)) as span:
+        medians = np.empty(len(keep))
+        for start in range(0, len(keep), 32):
+            block = keep[start:start + 32]
+            medians[start:start + 32] = np.nanmedian(buffer[:, block].astype(np.float64), axis=0)
+        span.output(medians)
+
+    # Imputing k missing values with the median m shifts the moments in closed form
+    count, mean, m2 = count[keep], mean[keep], m2[keep]
+    missing = n_rows - count
+    imputed_mean = (count * mean + missing * medians) / n_rows
+    imputed_m2 = m2 + count * missing / n_rows * (mean - medians) ** 2
+    scale = np.sqrt(imputed_m2 / n_rows)
+    scale[scale < 10 * np.finfo(np.float64).eps] = 1.0
+
+    with stage('impute_scale', buffer) as span:
+        for j, column in enumerate(keep):
+            # Kept columns move left in place, so the result is the buffer's leading columns
+            x = buffer[:, j]
+            if column != j:
+                x[:] = buffer[:, column]
+            x[np.isnan(x)] = medians[j]
+            x -= imputed_mean[j]
+            x /= scale[j]
+        x_scaled = span.output(buffer[:, :len(keep)])
+    df_data = pd.DataFrame(x_scaled, copy=False)
+    df_data.attrs['preprocessing'] = {'columns': keep, 'fill': medians, 'mean': imputed_mean, 'scale': scale}
+    return df_data, pd.Series(classes)
+
+
+def split_arrhythmia(df_data, df_class, test_size=0.3, random_state=43):
+    """Stratified train/test split of the preprocessed arrhythmia data."""
+    with stage('train_test_split', df_data) as span:
+        return span.output(train_test_split(df_data, df_class, test_size=test_size, shuffle=True,
+                                            stratify=df_class, random_state=random_state))
+
+
+def class_weights(y):
+    """Balanced class weights keyed by class label."""
+    classes = np.unique(y)
+    weights = compute_class_weight(class_weight="balanced", classes=classes, y=y)
+    return dict(zip(classes.tolist(), weights))
+
+
+def _singular_values(X, solver, n_components, random_state):
+    if solver == 'full':
+        return np.linalg.svd(X, compute_uv=False)
+    return randomized_svd(X, n_components, random_state=random_state)[1]
+
+
+def pca_sweep(X_train, solver='full', n_components=None, random_state=0):
+    """Explained-variance curves for every PCA component count from one SVD.
+
+    The singular values of the centered training matrix give the eigenvalue
+    of every component at once, so the curves for all k come from a single
+    decomposition instead of one PCA fit per k. ``solver='randomized'``
+    computes only the leading ``n_components`` singular values, which is much
+    cheaper for wide tables when only the head of the curve is needed.
+
+    Returns ``(pca_dict, eigen_dict)`` mapping the number of components to the
+    cumulative explained variance ratio and to the smallest retained
+    eigenvalue, as ``PCA(n_components=k)`` would report them.
+    """
+    if solver not in ('full', 'randomized'):
+        raise ValueError(f"unknown solver {solver!r}, expected 'full' or 'randomized'")
+    if solver == 'randomized' and n_components is None:
+        raise ValueError("solver='randomized' requires n_components")
+    X = np.asarray(X_train, dtype=float)
+    with stage('pca_sweep', X, solver=solver):
+        X = X - X.mean(axis=0)
+        s = memo.call(_singular_values, X, solver=solver, n_components=n_components, random_state=random_state)
+    if n_components is not None:
+        s = s[:n_components]
+
+    eigen_values = s ** 2 / (X.shape[0] - 1)
+    # Total variance from the data itself so truncated spectra give exact ratios
+    total_variance = np.einsum('ij,ij->', X, X) / (X.shape[0] - 1)
+    cumulative = np.cumsum(eigen_values) / total_variance
+
+    n_comps = range(1, len(s) + 1)
+    return dict(zip(n_comps, cumulative.tolist())), dict(zip(n_comps, eigen_values.tolist()))
+
+
+def select_pca_components(pca_dict, max_variance=0.95):
+    """Largest component count whose cumulative variance stays below ``max_variance``."""
+    return max(key for key, val in pca_dict.items() if val < max_variance)
+
+
+def fit_pca(X_train, X_test, n_components):
+    """Project train and test data onto ``n_components`` principal components."""
+    with stage('pca', X_train, n_components=n_components) as span:
+        pca = memo.fit(PCA(n_components=n_components), X_train)
+        X_train_pca = span.output(pca.transform(X_train))
+        X_test_pca = pca.transform(X_test)
+    return X_train_pca, X_test_pca, pca
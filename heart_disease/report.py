@@ -0,0 +1,139 @@
+"""Headless EDA report: every notebook figure rendered to image files.
+
+Figures are drawn with matplotlib's non-interactive Agg backend in a process
+pool and written next to an ``index.html`` that shows them in notebook order.
+Each figure is fingerprinted from the columns it reads and its arguments; a
+figure whose fingerprint matches the previous run's manifest is not redrawn.
+"""
+import hashlib
+import html
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from . import plots
+from ._lazy import pyplot
+from .plots import DISTRIBUTION_GRID
+
+MANIFEST = 'manifest.json'
+
+
+def _crosstab(column, title, xlabel, ticklabels=None):
+    return (column + '_by_target', title, plots.crosstab_by_target, [column, 'target'],
+            {'column': column, 'title': title, 'xlabel': xlabel, 'ticklabels': ticklabels})
+
+
+def _distribution(column, title):
+    return (column + '_distribution_by_target', title, plots.distribution_by_target, [column, 'target'],
+            {'column': column})
+
+
+# (name, title, plot function, input columns or None for all, keyword arguments)
+EDA_FIGURES = [
+    ('null_heatmap', 'Null Values Heatmap', plots.null_heatmap, None, {}),
+    ('target_pie', 'Heart Disease', plots.target_pie, ['target'], {}),
+    ('feature_distributions', 'Distribution of features', plots.feature_distributions,
+     [column for column, _, _, _ in DISTRIBUTION_GRID], {}),
+    ('age_by_target', 'Age distribution based on heart disease', plots.age_by_target, ['age', 'target'], {}),
+    _crosstab('cp', 'Heart Disease Frequency According to Chest Pain Type', 'Chest Pain Type',
+              ('typical angina', 'atypical angina', 'non-anginal pain', 'asymptomatic')),
+    _distribution('trestbps', 'Blood pressure distribution based on heart disease'),
+    _distribution('chol', 'Cholesterol distribution based on heart disease'),
+    _crosstab('fbs', 'Heart Disease Frequency According to Fasting Blood Sugar', 'Fasting Blood Sugar',
+              ('fbs < 120 mg/dl', 'fbs > 120 mg/dl')),
+    _crosstab('restecg', 'Heart Disease Frequency According to Resting Electrocardiographic Results',
+              'Resting Electrocardiographic Results',
+              ('normal', 'ST-T wave abnormality', 'probable or left ventricular hypertrophy')),
+    _distribution('thalach', 'Maximum heart rate distribution based on heart disease'),
+    _distribution('oldpeak', 'ST depression distribution based on heart disease'),
+    _crosstab('exang', 'Heart Disease Frequency According to Exercise Induced Angina', 'Exercise Induced Angina',
+              ('No', 'Yes')),
+    _crosstab('slope', 'Heart Disease Frequency According to Slope of the Peak Exercise ST Segment', 'Slope',
+              ('upsloping', 'flat', 'downsloping')),
+    _crosstab('ca', 'Heart Disease Frequency According to Number of Major Vessels Colored by Flourosopy',
+              'number of vessels'),
+    _crosstab('thal', 'Heart Disease Frequency According to Thalassemia', 'Thalassemia',
+              ('normal', 'fixed defect', 'reversible defect')),
+    ('correlation_heatmap', 'Correlation Matrix', plots.correlation_heatmap, None, {}),
+]
+
+
+def fingerprint(frame, func, kwargs):
+    """sha256 over a figure's input columns (names, dtypes, values), function and arguments."""
+    digest = hashlib.sha256()
+    digest.update(f"{func.__module__}.{func.__qualname__}{sorted(kwargs.items())!r}".encode())
+    digest.update(repr([(str(column), str(dtype)) for column, dtype in frame.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _use_agg():
+    pyplot().switch_backend('Agg')
+
+
+def _render(func, frame, kwargs, path, dpi):
+    plt = pyplot()
+    fig = func(frame, **kwargs)
+    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close('all')
+    return path
+
+
+def _read_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _write_index(out_dir, entries):
+    items = '\n'.join(
+        f'<section><h2>{html.escape(title)}</h2><img src="{html.escape(filename)}" alt="{html.escape(name)}"></section>'
+        for name, title, filename in entries)
+    page = ('<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8"><title>Heart disease EDA</title>\n'
+            '<style>img { max-width: 100%; }</style></head>\n'
+            f'<body>\n<h1>Heart disease EDA</h1>\n{items}\n</body>\n</html>\n')
+    path = os.path.join(out_dir, 'index.html')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(page)
+    return path
+
+
+def render_report(heart_df, out_dir, figures=EDA_FIGURES, max_workers=None, fmt='png', dpi=100, force=False):
+    """Render ``figures`` for ``heart_df`` into ``out_dir`` and write ``index.html``.
+
+    Figures are drawn in a process pool with the Agg backend. Unless
+    ``force`` is set, a figure is skipped when its fingerprint and output file
+    match the previous run. Returns ``{name: 'rendered' | 'cached'}``.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    previous = _read_manifest(out_dir)
+    manifest = {}
+    status = {}
+    entries = []
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_use_agg) as pool:
+        futures = {}
+        for name, title, func, columns, kwargs in figures:
+            frame = heart_df if columns is None else heart_df[columns]
+            filename = f'{name}.{fmt}'
+            path = os.path.join(out_dir, filename)
+            key = fingerprint(frame, func, dict(kwargs, dpi=dpi))
+            manifest[name] = {'fingerprint': key, 'file': filename}
+            entries.append((name, title, filename))
+
+            if not force and previous.get(name) == manifest[name] and os.path.exists(path):
+                status[name] = 'cached'
+            else:
+                futures[name] = pool.submit(_render, func, frame, kwargs, path, dpi)
+        for name, future in futures.items():
+            future.result()
+            status[name] = 'rendered'
+
+    with open(os.path.join(out_dir, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    _write_index(out_dir, entries)
+    return status
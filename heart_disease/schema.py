@@ -0,0 +1,24 @@
+"""Column schema of the Cleveland data, kept free of heavy imports.
+
+Scoring workers need the valid feature ranges but not pandas, so the schema
+lives here rather than in ``data``.
+"""
+
+# Cleveland columns -> (stored dtype, lowest valid value, highest valid value).
+# Categorical codes fit in int8; the continuous vitals are kept as float32.
+CLEVELAND_SCHEMA = {
+    'age': ('float32', 1, 120),
+    'sex': ('int8', 0, 1),
+    'cp': ('int8', 0, 3),
+    'trestbps': ('float32', 50, 250),
+    'chol': ('float32', 50, 700),
+    'fbs': ('int8', 0, 1),
+    'restecg': ('int8', 0, 2),
+    'thalach': ('float32', 50, 250),
+    'exang': ('int8', 0, 1),
+    'oldpeak': ('float32', -5, 10),
+    'slope': ('int8', 0, 2),
+    'ca': ('int8', 0, 3),
+    'thal': ('int8', 0, 2),
+    'condition': ('int8', 0, 1),
+}
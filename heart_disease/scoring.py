@@ -0,0 +1,120 @@
+"""Low-latency scoring with a persisted scaler + model artifact.
+
+An artifact is a single joblib file holding the fitted model, the scaler's
+mean and scale, the feature order and the valid range of every feature.
+``Scorer.load`` memory-maps its arrays, so loading is cheap and several
+worker processes share the same pages.
+
+Scoring standardizes with plain NumPy and calls the model with sklearn's
+input checks disabled, since ``validate`` has already checked the whole
+batch in a few vectorized comparisons. Tree models saved with
+``compiled=True`` are stored as ``trees.CompiledTrees`` and scored with NumPy
+alone; sklearn is then never imported by the scoring process.
+"""
+import joblib
+import numpy as np
+
+from .schema import CLEVELAND_SCHEMA
+from .trees import CompiledTrees, compile_trees
+
+FEATURES = [column for column in CLEVELAND_SCHEMA if column != 'condition']
+
+
+def save_artifact(path, model, scaler, feature_names=FEATURES, schema=CLEVELAND_SCHEMA, compiled=False,
+                  **metadata):
+    """Persist a fitted ``model`` and its ``StandardScaler`` for ``Scorer.load``.
+
+    ``compiled=True`` flattens a tree or forest model with ``trees.compile_trees``.
+    """
+    if compiled:
+        model = compile_trees(model)
+    artifact = {
+        'model': model,
+        'mean': np.asarray(scaler.mean_, dtype=np.float64),
+        'scale': np.asarray(scaler.scale_, dtype=np.float64),
+        'feature_names': list(feature_names),
+        'low': np.array([schema[name][1] for name in feature_names], dtype=np.float64),
+        'high': np.array([schema[name][2] for name in feature_names], dtype=np.float64),
+        'metadata': metadata,
+    }
+    joblib.dump(artifact, path)
+    return path
+
+
+class Scorer:
+    """Scores Cleveland-schema patients with a persisted model."""
+
+    def __init__(self, model, mean, scale, feature_names, low, high, metadata=None):
+        # Plain ndarray views of the memory maps: arithmetic on np.memmap
+        # objects goes through subclass wrapping on every call.
+        self.model = model
+        self.mean = np.asarray(mean)
+        self.scale = np.asarray(scale)
+        self.feature_names = list(feature_names)
+        self.low = np.asarray(low)
+        self.high = np.asarray(high)
+        self.metadata = metadata or {}
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        artifact = joblib.load(path, mmap_mode=mmap_mode)
+        return cls(artifact['model'], artifact['mean'], artifact['scale'], artifact['feature_names'],
+                   artifact['low'], artifact['high'], artifact.get('metadata'))
+
+    def as_matrix(self, records):
+        """Float64 matrix in feature order from an array or a list of dicts/sequences."""
+        if isinstance(records, np.ndarray):
+            X = records
+        elif len(records) and isinstance(records[0], dict):
+            names = self.feature_names
+            X = np.array([[record[name] for name in names] for record in records], dtype=np.float64)
+        else:
+            X = np.asarray(records, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return np.asarray(X, dtype=np.float64)
+
+    def validate(self, X):
+        """Raise ``ValueError`` unless every value is finite and inside its feature's range."""
+        if X.ndim != 2 or X.shape[1] != len(self.feature_names):
+            raise ValueError(f"expected {len(self.feature_names)} features per row, got shape {X.shape}")
+        bad = ~((X >= self.low) & (X <= self.high))  # NaN fails both comparisons
+        if bad.any():
+            row, col = np.argwhere(bad)[0]
+            raise ValueError(f"row {row}: {self.feature_names[col]}={X[row, col]} is outside "
+                             f"[{self.low[col]:g}, {self.high[col]:g}] ({int(bad.sum())} invalid values)")
+        return X
+
+    def transform(self, X):
+        return (X - self.mean) / self.scale
+
+    def predict_batch(self, records, proba=False):
+        """Predicted classes, or class probabilities with ``proba=True``, for many rows."""
+        Z = self.transform(self.validate(self.as_matrix(records)))
+        if isinstance(self.model, CompiledTrees):
+            return self.model.predict_proba(Z) if proba else self.model.predict(Z)
+        import sklearn
+
+        with sklearn.config_context(assume_finite=True, skip_parameter_validation=True):
+            if proba:
+                return self.model.predict_proba(Z)
+            return self.model.predict(Z)
+
+    def predict_with_proba(self, records):
+        """``(classes, probabilities)`` for many rows, validating them once."""
+        Z = self.transform(self.validate(self.as_matrix(records)))
+        if isinstance(self.model, CompiledTrees):
+            # The tree ensemble's predict is the argmax of predict_proba; walk the trees once
+            probabilities = self.model.predict_proba(Z)
+            return self.model.classes.take(np.argmax(probabilities, axis=1)), probabilities
+        import sklearn
+
+        with sklearn.config_context(assume_finite=True, skip_parameter_validation=True):
+            return self.model.predict(Z), self.model.predict_proba(Z)
+
+    def predict_one(self, record, proba=False):
+        """Prediction for one patient given as a dict or a feature sequence."""
+        if isinstance(record, dict):
+            record = [record[name] for name in self.feature_names]
+        result = self.predict_batch(np.asarray(record, dtype=np.float64).reshape(1, -1), proba=proba)
+        return result[0]
@@ -0,0 +1,216 @@
+"""Per-class summary statistics and correlations of the Cleveland features."""
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import cache
+
+SUMMARY_COLUMNS = ['age', 'trestbps', 'chol', 'oldpeak']
+
+
+class TargetSummary:
+    """Mergeable accumulator of count, min, max and mean per class.
+
+    ``update`` folds in one frame (or chunk of a larger extract) with a single
+    grouped aggregation; only per-class counts, sums, minima and maxima are
+    kept, so memory does not grow with the number of rows seen. Accumulators
+    built on separate chunks or workers can be combined with ``merge``.
+    """
+
+    def __init__(self, columns=SUMMARY_COLUMNS, target='target'):
+        self.columns = list(columns)
+        self.target = target
+        self.count = None
+        self.sum = None
+        self.min = None
+        self.max = None
+
+    def update(self, frame):
+        grouped = frame.groupby(self.target, sort=True)[self.columns]
+        # Sums are accumulated in float64 so float32 extracts stay accurate
+        total = frame[self.columns].astype(np.float64).groupby(frame[self.target], sort=True).sum()
+        self._combine(grouped.count(), total, grouped.min(), grouped.max())
+        return self
+
+    def merge(self, other):
+        if other.count is not None:
+            self._combine(other.count, other.sum, other.min, other.max)
+        return self
+
+    def _combine(self, count, total, low, high):
+        if self.count is None:
+            self.count, self.sum, self.min, self.max = count, total, low, high
+            return
+        self.count = self.count.add(count, fill_value=0)
+        self.sum = self.sum.add(total, fill_value=0)
+        self.min = self.min.combine(low, np.fmin)
+        self.max = self.max.combine(high, np.fmax)
+
+    def table(self):
+        """Tidy table indexed by ``(column, class)`` with count, min, max and mean."""
+        if self.count is None:
+            raise ValueError("no data has been added to the summary")
+        stats = {
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.sum / self.count,
+        }
+        table = pd.concat({name: frame.stack() for name, frame in stats.items()}, axis=1)
+        table.index = table.index.set_names([self.target, 'column'])
+        return table.swaplevel().sort_index(level='column', sort_remaining=False).loc[self.columns]
+
+
+def describe_by_target(data, columns=SUMMARY_COLUMNS, target='target'):
+    """Count, min, max and mean of ``columns`` for every value of ``target``.
+
+    ``data`` is a DataFrame or an iterable of DataFrame chunks, such as
+    ``pd.read_csv(..., chunksize=n)``. Returns the ``TargetSummary.table``.
+    """
+    summary = TargetSummary(columns, target)
+    if isinstance(data, pd.DataFrame):
+        data = [data]
+    for frame in data:
+        summary.update(frame)
+    return summary.table()
+
+
+def batch_key(frame):
+    """Content hash of a frame's values; ``CorrelationSummary`` uses it to spot changed batches."""
+    return cache.content_hash(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+
+
+def _combine(a, b):
+    """Pairwise (Chan et al.) merge of two ``(count, mean, comoment)`` triples."""
+    count = a[0] + b[0]
+    if not b[0]:
+        return a
+    if not a[0]:
+        return b
+    delta = b[1] - a[1]
+    return (count, a[1] + delta * (b[0] / count),
+            a[2] + b[2] + np.outer(delta, delta) * (a[0] * b[0] / count))
+
+
+class CorrelationSummary:
+    """Mergeable streaming accumulator of the covariance and correlation matrices.
+
+    Each ``update`` computes the chunk's count, mean and centered co-moment
+    matrix, and the totals combine them with the pairwise (Chan et al.) form
+    of Welford's update, so the result matches a single pass over all rows
+    without keeping any of them. Rows with a missing value are skipped.
+
+    Chunks passed with a ``batch`` name keep their moments separately, with a
+    hash of their content: updating a batch again with the same content does
+    nothing, and with changed content (e.g. an edited source file) replaces
+    its old contribution. Chunks without a name are pooled. The state is
+    saved and loaded in the ``cache`` layout, so new extracts can be added to
+    a persisted summary without rescanning the old ones.
+    """
+
+    def __init__(self, columns, parts=None):
+        self.columns = list(columns)
+        # Batch name (None for unnamed chunks) -> (content hash, count, mean, comoment)
+        self.parts = dict(parts or {})
+
+    def update(self, frame, batch=None):
+        frame = frame[self.columns]
+        version = None if batch is None else batch_key(frame)
+        if batch is not None and batch in self.parts and self.parts[batch][0] == version:
+            return self
+        X = frame.to_numpy(dtype=np.float64)
+        X = X[~np.isnan(X).any(axis=1)]
+        n = len(self.columns)
+        moments = (0, np.zeros(n), np.zeros((n, n)))
+        if len(X):
+            mean = X.mean(axis=0)
+            centered = X - mean
+            moments = (len(X), mean, centered.T @ centered)
+        if batch is None and None in self.parts:
+            moments = _combine(self.parts[None][1:], moments)
+        self.parts[batch] = (version,) + moments
+        return self
+
+    def merge(self, other):
+        if other.columns != self.columns:
+            raise ValueError("cannot merge correlation summaries over different columns")
+        overlap = sorted(set(self.parts) & set(other.parts) - {None})
+        if overlap:
+            raise ValueError(f"both summaries already contain the batches {overlap}")
+        for batch, part in other.parts.items():
+            if batch is None and None in self.parts:
+                part = (None,) + _combine(self.parts[None][1:], part[1:])
+            self.parts[batch] = part
+        return self
+
+    @property
+    def batches(self):
+        return [batch for batch in self.parts if batch is not None]
+
+    def _totals(self):
+        n = len(self.columns)
+        totals = (0, np.zeros(n), np.zeros((n, n)))
+        for part in self.parts.values():
+            totals = _combine(totals, part[1:])
+        return totals
+
+    @property
+    def count(self):
+        return int(sum(part[1] for part in self.parts.values()))
+
+    def covariance(self):
+        """Sample covariance matrix (``ddof=1``), as ``DataFrame.cov``."""
+        count, _, comoment = self._totals()
+        if count < 2:
+            raise ValueError("at least two complete rows are needed for a covariance")
+        return pd.DataFrame(comoment / (count - 1), index=self.columns, columns=self.columns)
+
+    def correlation(self):
+        """Pearson correlation matrix, as ``DataFrame.corr``."""
+        covariance = self.covariance()
+        std = np.sqrt(np.diag(covariance.to_numpy()))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = covariance.to_numpy() / np.outer(std, std)
+        np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+        return pd.DataFrame(np.clip(corr, -1.0, 1.0), index=self.columns, columns=self.columns)
+
+    def with_target(self, target='target'):
+        """Correlation of every other column with ``target``, strongest first."""
+        corr = self.correlation()[target].drop(target)
+        return corr.reindex(corr.abs().sort_values(ascending=False).index)
+
+    def save(self, path):
+        path = os.path.abspath(path)
+        n = len(self.columns)
+        parts = list(self.parts.items())
+        arrays = {
+            'count': np.array([part[1] for _, part in parts], dtype=np.int64),
+            'mean': np.array([part[2] for _, part in parts], dtype=np.float64).reshape(-1, n),
+            'comoment': np.array([part[3] for _, part in parts], dtype=np.float64).reshape(-1, n, n),
+        }
+        manifest = {'columns': self.columns, 'batches': [batch for batch, _ in parts],
+                    'versions': [part[0] for _, part in parts]}
+        cache.store(os.path.basename(path), arrays, manifest, os.path.dirname(path))
+        return self
+
+    @classmethod
+    def load(cls, path):
+        path = os.path.abspath(path)
+        arrays, manifest = cache.load(os.path.basename(path), os.path.dirname(path), mmap_mode=None)
+        parts = {batch: (version, int(count), mean, comoment)
+                 for batch, version, count, mean, comoment in zip(manifest['batches'], manifest['versions'],
+                                                                  arrays['count'], arrays['mean'],
+                                                                  arrays['comoment'])}
+        return cls(manifest['columns'], parts)
+
+    @classmethod
+    def open(cls, path, columns):
+        """The summary saved at ``path``, or an empty one over ``columns``.
+
+        A missing entry, or one saved in an older layout, starts empty.
+        """
+        try:
+            return cls.load(path)
+        except (FileNotFoundError, KeyError):
+            return cls(columns)
@@ -0,0 +1,103 @@
+"""Synthetic Cleveland-schema and arrhythmia-shaped data at arbitrary scale.
+
+Cleveland rows are drawn class by class: the target follows its observed
+frequency and every feature is sampled from its empirical distribution within
+that class, so per-class marginals (and hence a learnable signal) are
+preserved while rows are independent of the 297 real patients. Continuous
+vitals get a little jitter, rounded back to the resolution of the source
+column and clipped to its observed range.
+"""
+import numpy as np
+import pandas as pd
+
+from .data import CLEVELAND_SCHEMA, read_cleveland
+
+CLEVELAND_ROWS = 297
+ARRHYTHMIA_ROWS = 452
+
+
+def _column_sampler(source, schema):
+    """Per class: column -> (values, jitter sd, decimals) from the source frame."""
+    samplers = {}
+    target = source['condition'].to_numpy()
+    for label in np.unique(target):
+        rows = source[target == label]
+        columns = {}
+        for column, (dtype, _, _) in schema.items():
+            if column == 'condition':
+                continue
+            values = rows[column].to_numpy()
+            if dtype.startswith('int'):
+                columns[column] = (values, 0.0, 0)
+            else:
+                integral = np.all(np.round(values) == values)
+                columns[column] = (values, 0.05 * float(np.std(values)), 0 if integral else 1)
+        samplers[label] = columns
+    return samplers
+
+
+def iter_synthetic_cleveland(n_rows, chunk_rows=1000000, seed=0, source=None, schema=CLEVELAND_SCHEMA):
+    """Yield Cleveland-schema frames (schema dtypes, ``condition`` target) totalling ``n_rows``."""
+    if source is None:
+        source = read_cleveland(schema=schema)
+    rng = np.random.default_rng(seed)
+    samplers = _column_sampler(source, schema)
+    labels, counts = np.unique(source['condition'].to_numpy(), return_counts=True)
+    class_p = counts / counts.sum()
+
+    remaining = n_rows
+    while remaining > 0:
+        size = min(chunk_rows, remaining)
+        target = rng.choice(labels, size=size, p=class_p)
+        chunk = {}
+        for column, (dtype, low, high) in schema.items():
+            if column == 'condition':
+                chunk[column] = target.astype(dtype)
+                continue
+            observed = source[column].to_numpy()
+            low, high = max(low, observed.min()), min(high, observed.max())
+            out = np.empty(size, dtype=np.float64)
+            for label in labels:
+                mask = target == label
+                values, jitter, decimals = samplers[label][column]
+                drawn = rng.choice(values, size=int(mask.sum())).astype(np.float64)
+                if jitter:
+                    drawn = np.round(drawn + rng.normal(0.0, jitter, drawn.shape), decimals)
+                out[mask] = drawn
+            chunk[column] = np.clip(out, low, high).astype(dtype)
+        yield pd.DataFrame(chunk)
+        remaining -= size
+
+
+def synthetic_cleveland(n_rows, seed=0, source=None):
+    """``n_rows`` synthetic Cleveland rows as one frame."""
+    return pd.concat(list(iter_synthetic_cleveland(n_rows, seed=seed, source=source)), ignore_index=True)
+
+
+def write_synthetic_cleveland(path, n_rows, chunk_rows=1000000, seed=0, source=None):
+    """Stream ``n_rows`` synthetic rows to a CSV without holding them all in memory."""
+    header = True
+    with open(path, 'w', newline='') as f:
+        for chunk in iter_synthetic_cleveland(n_rows, chunk_rows=chunk_rows, seed=seed, source=source):
+            chunk.to_csv(f, header=header, index=False)
+            header = False
+    return path
+
+
+def synthetic_arrhythmia(n_rows, n_features=278, n_classes=13, n_factors=20, seed=0):
+    """Standardized arrhythmia-shaped matrix with a decaying spectrum, and class labels.
+
+    Columns are noisy mixtures of ``n_factors`` latent factors whose variance
+    falls off with rank, and classes are separated in the factor space, so
+    the PCA sweep and the SVM grid see correlated, low-rank structure similar
+    to the preprocessed ECG attributes.
+    """
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, n_classes, size=n_rows)
+    factor_scale = 1.0 / np.arange(1, n_factors + 1)
+    centers = rng.normal(size=(n_classes, n_factors)) * factor_scale
+    factors = rng.normal(size=(n_rows, n_factors)) * factor_scale + centers[y]
+    X = factors @ rng.normal(size=(n_factors, n_features)) + rng.normal(scale=0.3, size=(n_rows, n_features))
+    X -= X.mean(axis=0)
+    X /= X.std(axis=0)
+    return X, y
@@ -0,0 +1,179 @@
+"""Structured timing traces for the pipeline stages.
+
+Pipeline functions wrap their hot paths in ``stage(name, data)``. While a
+tracer is active every stage appends one JSON object per line to the trace
+file with its duration, input and output shapes and memory use::
+
+    {"stage": "fit", "model": "RF_model", "duration_s": 0.031,
+     "input_shape": [222, 13], "output_shape": null, "mem_delta_mb": 0.4, ...}
+
+Tracing is off unless ``enable(path)`` is called or ``HEART_DISEASE_TRACE``
+names a trace file; ``HEART_DISEASE_PROFILE_DIR`` additionally dumps a cProfile
+``.prof`` file per stage. Stages nested inside a profiled stage are covered by
+the outer profile rather than profiled again. The environment variables are
+set by ``enable`` so worker processes write to the same file; each record is a
+single ``O_APPEND`` write, so lines from concurrent writers do not interleave.
+When tracing is off ``stage`` costs one attribute lookup.
+"""
+import contextlib
+import contextvars
+import cProfile
+import itertools
+import json
+import os
+import time
+
+from ._resources import RSSSampler
+
+TRACE_ENV = 'HEART_DISEASE_TRACE'
+PROFILE_ENV = 'HEART_DISEASE_PROFILE_DIR'
+
+_active = None
+_parent = contextvars.ContextVar('heart_disease_stage', default=None)
+_profiling = contextvars.ContextVar('heart_disease_profiling', default=False)
+
+
+def shape_of(obj):
+    """Shape of an array-like as a list, shapes of a tuple of them, else None."""
+    shape = getattr(obj, 'shape', None)
+    if shape is not None:
+        return list(shape)
+    if isinstance(obj, (tuple, list)) and obj and any(hasattr(item, 'shape') for item in obj):
+        return [shape_of(item) for item in obj]
+    return None
+
+
+class Span:
+    """Handle yielded by ``stage``; ``output`` records what the stage produced
+    and ``set`` adds fields known only once the stage has run."""
+
+    __slots__ = ('output_shape', 'fields')
+
+    def __init__(self):
+        self.output_shape = None
+        self.fields = {}
+
+    def output(self, obj):
+        self.output_shape = shape_of(obj)
+        return obj
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def output(self, obj):
+        return obj
+
+    def set(self, **fields):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Appends stage records as JSON lines to ``path``."""
+
+    def __init__(self, path, profile_dir=None):
+        self.path = path
+        self.profile_dir = profile_dir
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._seq = itertools.count()
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    def emit(self, record):
+        os.write(self._fd, (json.dumps(record, default=str) + '\n').encode())
+
+    def profile_path(self, name):
+        return os.path.join(self.profile_dir, f'{os.getpid()}_{next(self._seq):05d}_{name}.prof')
+
+    def close(self):
+        os.close(self._fd)
+
+
+def enable(path, profile_dir=None):
+    """Start writing traces to ``path`` in this process and in workers started from it."""
+    global _active
+    disable()
+    _active = Tracer(path, profile_dir)
+    os.environ[TRACE_ENV] = path
+    if profile_dir:
+        os.environ[PROFILE_ENV] = profile_dir
+    else:
+        os.environ.pop(PROFILE_ENV, None)
+    return _active
+
+
+def disable():
+    global _active
+    if _active is not None:
+        _active.close()
+        _active = None
+    os.environ.pop(TRACE_ENV, None)
+    os.environ.pop(PROFILE_ENV, None)
+
+
+def enabled():
+    return _active is not None
+
+
+@contextlib.contextmanager
+def stage(name, data=None, **fields):
+    """Trace the enclosed block as stage ``name`` reading ``data``.
+
+    Extra keyword arguments (e.g. ``model='RF_model'``) are added to the
+    record. Use the yielded span's ``output(obj)`` to record the output shape.
+    """
+    tracer = _active
+    if tracer is None:
+        yield _NULL_SPAN
+        return
+
+    span = Span()
+    profiler = None
+    if tracer.profile_dir and not _profiling.get():
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already running (e.g. in a sibling thread on 3.12+)
+            profiler = None
+    parent_token = _parent.set(name)
+    profiling_token = _profiling.set(_profiling.get() or profiler is not None)
+    try:
+        with RSSSampler() as rss:
+            start = time.perf_counter()
+            yield span
+            duration = time.perf_counter() - start
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        _profiling.reset(profiling_token)
+        _parent.reset(parent_token)
+
+    record = {
+        'ts': time.time(),
+        'pid': os.getpid(),
+        'stage': name,
+        'parent': _parent.get(),
+        'duration_s': round(duration, 6),
+        'input_shape': shape_of(data),
+        'output_shape': span.output_shape,
+        'rss_mb': round(rss.end / 2 ** 20, 2),
+        'mem_delta_mb': round((rss.end - rss.start) / 2 ** 20, 3),
+        'peak_mb': round(rss.peak / 2 ** 20, 2),
+    }
+    record.update(fields)
+    record.update(span.fields)
+    if profiler is not None:
+        record['profile'] = tracer.profile_path(name)
+        profiler.dump_stats(record['profile'])
+    tracer.emit(record)
+
+
+if os.environ.get(TRACE_ENV):
+    _active = Tracer(os.environ[TRACE_ENV], os.environ.get(PROFILE_ENV))
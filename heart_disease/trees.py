@@ -0,0 +1,131 @@
+"""Array-backed inference for fitted decision trees and random forests.
+
+``compile_trees`` flattens a fitted ``DecisionTreeClassifier`` or
+``RandomForestClassifier`` into a handful of contiguous arrays shared by all
+of its trees: split feature, threshold, left/right child, NaN direction and
+per-node class fractions. ``CompiledTrees`` then walks every tree for a whole
+batch at once, one vectorized step per tree level, and needs only NumPy.
+
+Results are bit-identical to sklearn's ``predict``/``predict_proba``: inputs
+are cast to float32 before comparing against the float64 thresholds, and the
+per-tree probabilities are summed in estimator order and divided by the number
+of trees, as sklearn's forest does when it predicts on a single thread.
+"""
+import joblib
+import numpy as np
+
+_ARRAYS = ('feature', 'threshold', 'left', 'right', 'missing_left', 'value', 'roots', 'classes')
+
+
+def _tree_arrays(tree, offset):
+    """Flat node arrays of one sklearn ``Tree``, with node ids shifted by ``offset``.
+
+    Leaves point at themselves, so extra traversal steps past a leaf are no-ops.
+    """
+    nodes = np.arange(tree.node_count)
+    leaf = tree.children_left == -1
+    missing_left = getattr(tree, 'missing_go_to_left', None)
+    if missing_left is None:
+        missing_left = np.zeros(tree.node_count, dtype=bool)
+    return {
+        'feature': np.where(leaf, 0, tree.feature),
+        'threshold': np.where(leaf, np.inf, tree.threshold),
+        'left': np.where(leaf, nodes, tree.children_left) + offset,
+        'right': np.where(leaf, nodes, tree.children_right) + offset,
+        'missing_left': np.asarray(missing_left, dtype=bool),
+        'value': tree.value[:, 0, :],
+    }
+
+
+def compile_trees(model):
+    """Flatten a fitted single-output tree or forest classifier into a ``CompiledTrees``."""
+    if hasattr(model, 'estimators_'):
+        estimators, average = list(model.estimators_), True
+    elif hasattr(model, 'tree_'):
+        estimators, average = [model], False
+    else:
+        raise TypeError(f"expected a fitted decision tree or random forest classifier, got {type(model).__name__}")
+    if getattr(model, 'n_outputs_', 1) != 1:
+        raise ValueError("only single-output classifiers can be compiled")
+
+    parts, roots, offset = [], [], 0
+    for estimator in estimators:
+        tree = estimator.tree_
+        parts.append(_tree_arrays(tree, offset))
+        roots.append(offset)
+        offset += tree.node_count
+    n_classes = len(model.classes_)
+    arrays = {
+        'feature': np.concatenate([part['feature'] for part in parts]).astype(np.intp),
+        'threshold': np.concatenate([part['threshold'] for part in parts]).astype(np.float64),
+        'left': np.concatenate([part['left'] for part in parts]).astype(np.intp),
+        'right': np.concatenate([part['right'] for part in parts]).astype(np.intp),
+        'missing_left': np.concatenate([part['missing_left'] for part in parts]),
+        'value': np.ascontiguousarray(np.concatenate([part['value'][:, :n_classes] for part in parts]),
+                                      dtype=np.float64),
+        'roots': np.array(roots, dtype=np.intp),
+        'classes': np.asarray(model.classes_),
+    }
+    max_depth = max(estimator.tree_.max_depth for estimator in estimators)
+    return CompiledTrees(arrays, max_depth=max_depth, average=average, n_features=model.n_features_in_)
+
+
+class CompiledTrees:
+    """NumPy-only ``predict``/``predict_proba`` over flattened trees."""
+
+    def __init__(self, arrays, max_depth, average, n_features):
+        for name in _ARRAYS:
+            setattr(self, name, np.asarray(arrays[name]))
+        self.max_depth = int(max_depth)
+        self.average = bool(average)
+        self.n_features_in_ = int(n_features)
+
+    def __setstate__(self, state):
+        # Unpickling (e.g. inside a scoring artifact) bypasses __init__; fancy
+        # indexing into np.memmap objects is much slower than into plain views.
+        self.__dict__.update(state)
+        for name in _ARRAYS:
+            setattr(self, name, np.asarray(getattr(self, name)))
+
+    @property
+    def classes_(self):
+        return self.classes
+
+    def save(self, path):
+        joblib.dump({
+            'arrays': {name: getattr(self, name) for name in _ARRAYS},
+            'max_depth': self.max_depth,
+            'average': self.average,
+            'n_features': self.n_features_in_,
+        }, path)
+        return path
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        state = joblib.load(path, mmap_mode=mmap_mode)
+        return cls(state['arrays'], state['max_depth'], state['average'], state['n_features'])
+
+    def apply(self, X):
+        """Leaf node id reached by every row in every tree, shape (n_trees, n_samples)."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"expected {self.n_features_in_} features per row, got shape {X.shape}")
+        rows = np.arange(X.shape[0])
+        node = np.repeat(self.roots[:, None], X.shape[0], axis=1)
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            go_left = (x <= self.threshold[node]) | (np.isnan(x) & self.missing_left[node])
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def predict_proba(self, X):
+        leaves = self.apply(X)
+        proba = np.zeros((leaves.shape[1], self.value.shape[1]), dtype=np.float64)
+        for tree_leaves in leaves:
+            proba += self.value[tree_leaves]
+        if self.average:
+            proba /= len(leaves)
+        return proba
+
+    def predict(self, X):
+        return self.classes.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
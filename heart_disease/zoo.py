@@ -0,0 +1,84 @@
+"""Fit and score several classifiers concurrently in a process pool.
+
+The train and test matrices are copied once into shared memory; every worker
+attaches to the same pages from its initializer instead of receiving a
+pickled copy with each task, so wall-clock time approaches that of the
+slowest model rather than the sum over all of them.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .evaluation import score_model
+from .tracing import stage
+
+# Populated in each worker by _attach: array name -> ndarray view onto the
+# shared segment. The handles are kept open for the life of the worker since
+# fitted estimators such as KNN may hold on to views of the training data.
+_shared = {}
+_handles = []
+
+
+def _share(array):
+    array = np.ascontiguousarray(array)
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+def _attach(specs):
+    for key, (name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _handles.append(shm)
+        _shared[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _fit_and_score(name, model):
+    with stage('fit', _shared['x_train'], model=name):
+        start = time.perf_counter()
+        model.fit(_shared['x_train'], _shared['y_train'])
+        fit_time = time.perf_counter() - start
+    scores = score_model(model, _shared['x_test'], _shared['y_test'])
+    scores['fit_time'] = fit_time
+    return name, model, scores
+
+
+def train_zoo(models, x_train, y_train, x_test, y_test, max_workers=None, mp_context=None):
+    """Fit and score every model of ``{name: estimator}`` in parallel.
+
+    Returns ``(results, fitted)``: a DataFrame indexed by model name with
+    ``accuracy``, ``fit_time``, ``report``, ``confusion_matrix`` and
+    ``y_pred`` columns, and a dict of the fitted estimators in the order of
+    ``models``.
+    """
+    if max_workers is None:
+        max_workers = min(len(models), os.cpu_count() or 1)
+
+    segments = []
+    specs = {}
+    try:
+        for key, array in (('x_train', x_train), ('y_train', y_train), ('x_test', x_test), ('y_test', y_test)):
+            shm, specs[key] = _share(np.asarray(array))
+            segments.append(shm)
+
+        rows = {}
+        fitted = {}
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context,
+                                 initializer=_attach, initargs=(specs,)) as pool:
+            futures = [pool.submit(_fit_and_score, name, model) for name, model in models.items()]
+            for future in as_completed(futures):
+                name, model, scores = future.result()
+                fitted[name] = model
+                rows[name] = scores
+    finally:
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+
+    results = pd.DataFrame.from_dict(rows, orient='index')
+    results = results.loc[list(models), ['accuracy', 'fit_time', 'report', 'confusion_matrix', 'y_pred']]
+    return results, {name: fitted[name] for name in models}
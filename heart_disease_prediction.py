@@ -63,52 +63,44 @@ There are 14 features in the dataset, which are described below.
 ## Importing all the required libraries
 """
 
+import os
+
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
-from collections import Counter
-import seaborn as sns
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
-
-from sklearn.preprocessing import StandardScaler
-from sklearn.pipeline import Pipeline
-from sklearn.model_selection import train_test_split, cross_val_score, KFold
-from sklearn.ensemble import AdaBoostClassifier, RandomForestClassifier
 from sklearn.svm import SVC
-from sklearn.linear_model import LogisticRegression
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.tree import DecisionTreeClassifier
+
+from heart_disease import cache, crossval, data, evaluation, features, incremental, linear, models, neural, plots, preprocessing, scoring, summary, zoo
 
 import warnings
 warnings.filterwarnings("ignore")
 
+# Set HEART_DISEASE_TRACE=trace.jsonl before running to record a JSON-lines timing trace
+# of every pipeline stage (and HEART_DISEASE_PROFILE_DIR=profiles for a cProfile dump per stage).
+
 """## Data Loading"""
 
-heart = pd.read_csv("heart_cleveland_upload.csv")
-heart.head(10)
+heart_df = data.load_cleveland()
+heart_df.head(10)
+
+# `heart (1).csv` holds the same patients with different category codes and an inverted target;
+# harmonize.load_harmonized(('cleveland', 'heart')) maps both onto this schema (and caches the result).
 
 """## Exploring the dataset"""
 
 # using info() method to get the concise summary of the dataframe.
-print(heart.info())
+print(heart_df.info())
 
 """*In above summary We can see that there are total 297 rows and 14 columns present in the dataset. the summary also includes list of all columns with their data types and the number of non-null values in each column. we also have the value of rangeindex provided for the index axis.*"""
 
-# creating a copy of dataset so that will not affect our original dataset.
-heart_df = heart.copy()
+"""*`load_cleveland` renames the `condition` column to `target`.*
 
-# Renaming the column 
-heart_df = heart_df.rename(columns={'condition':'target'})
-heart_df.head()
-
-"""## Checking null values """
+## Checking null values """
 
 # check if there is any Null value using isnull() method
 heart_df.isnull().values.any()
 
 ## this is the visual representation of null values present in data
-sns.heatmap(heart_df.isnull(),cmap="icefire")
-plt.title('Null Values Heatmap')
+plots.null_heatmap(heart_df)
 plt.show()
 
 """*Fortunately, there is no missing values present in the dataset.*"""
@@ -118,6 +110,10 @@ heart_df.nunique()
 
 """## Exploratory Data analysis and visualisation
 
+Every figure of this section can also be rendered without a display, e.g. in batch jobs,
+with `report.render_report(heart_df, 'eda_report')`, which writes the images and an
+`index.html` and only redraws figures whose input columns changed since the last run.
+
 ### Distribution of target variable
 """
 
@@ -127,11 +123,7 @@ heart_df['target'].value_counts()
 heart_df['target'].value_counts()/heart_df.shape[0]*100
 
 # Create a plot to display the percentage of the positive and negative heart disease 
-labels = ['yes', 'No']
-values = heart_df['target'].value_counts().values
-
-plt.pie(values, labels=labels, autopct='%1.0f%%')
-plt.title('Heart Disease')
+plots.target_pie(heart_df)
 plt.show()
 
 """*As 54% of the person have heart attack so data is almost balanced so no need to balance the data.*
@@ -139,65 +131,7 @@ plt.show()
 ### Distribution of features
 """
 
-fig=plt.figure(figsize=(16, 16))
-fig = plt.subplot(431)
-sns.kdeplot(heart_df['age'],shade=True,label=' Age')
-# plt.title ('Distribution of Age')
-plt.legend()
-fig = plt.subplot(432)
-heart_df['sex'].value_counts().plot(kind='bar',label=' sex', color="lightpink")
-plt.xlabel('sex')
-# plt.title ('Distribution of sex')
-plt.legend()
-fig = plt.subplot(433)
-heart_df['cp'].value_counts().plot(kind='bar',label='pain')
-plt.xlabel('cp')
-# plt.title ('Distribution of chest pain')
-plt.legend()
-fig = plt.subplot(434)
-# sns.kdeplot(data['trtbps'],shade=True,label='blood pressure')
-sns.distplot(heart_df['trestbps'], color="red",  kde= True,label='Blood Pressure')
-# plt.title ('Distribution of blood pressure')
-plt.legend()
-fig = plt.subplot(435)
-sns.kdeplot(heart_df['chol'],shade=True,label='cholestrol')
-# plt.title ('Distribution of cholestrol')
-plt.legend()
-fig = plt.subplot(436)
-heart_df['fbs'].value_counts().plot(kind='bar',label='Blood sugar', color="lightblue")
-plt.xlabel('fbs')
-# plt.title ('Distribution of blood sugar')
-plt.legend()
-fig = plt.subplot(437)
-heart_df['restecg'].value_counts().plot(kind='bar',label='Electrocardiographic result')
-plt.xlabel('restecg')
-# plt.title ('Distribution of electrocardiographic result')
-plt.legend()
-fig = plt.subplot(438)
-# sns.kdeplot(data['thalachh'],shade=True,label='Maximum heart rate')
-sns.distplot(heart_df['thalach'], color="red",  kde= True,label='Maximum heart rate')
-# plt.title ('Distribution of maximum heart rate')
-plt.legend()
-fig = plt.subplot(439)
-heart_df['exang'].value_counts().plot(kind='bar',label='Induced engina', color="orange")
-plt.xlabel('exang')
-# plt.title ('Distribution of induced engina')
-plt.legend()
-fig = plt.subplot(4,3,10)
-sns.kdeplot(heart_df['oldpeak'],shade=True,label='Old peak')
-plt.xlabel('oldpeak')
-# plt.title ('Distribution of old peak')
-plt.legend()
-fig = plt.subplot(4,3,11)
-heart_df['slope'].value_counts().plot(kind='bar',label='Slope', color="brown")
-plt.xlabel('slope')
-# plt.title ('Distribution of slope')
-plt.legend()
-fig = plt.subplot(4,3,12)
-heart_df['ca'].value_counts().plot(kind='bar',label='Major vessels')
-plt.xlabel('ca')
-# plt.title ('Distribution of no. of major vessels')
-plt.legend()
+plots.feature_distributions(heart_df)
 plt.show()
 
 """*Most of the people have age between 50-60, are male, have less chest pain, blood pressure between 120 to 140, cholestrol between 200-300, blood sugar less than 120 and heart rate between 150-175.*
@@ -207,36 +141,32 @@ plt.show()
 ### Age distribution based on heart disease
 """
 
-fig=plt.figure(figsize=(16,6))
-fig = plt.subplot(121)
-sns.distplot(heart_df[heart_df['target'] == 0]["age"], color='green',label='No heart Disease') 
-sns.distplot(heart_df[heart_df['target'] == 1]["age"], color='red',label='Heart Disease') #Red for heart disease
-plt.ylabel('Frequency')
-plt.xlabel('Age')
-plt.title('Age distribtuion based on heart disease', fontsize=15)
-plt.legend()
+# min, max and average of age, blood pressure, cholestoral and ST depression for
+# both classes, computed in a single grouped pass
+target_summary = summary.describe_by_target(heart_df, ['age', 'trestbps', 'chol', 'oldpeak'])
+target_summary
+
+plots.age_by_target(heart_df)
 plt.show()
 
 # Get min, max and average of the age of the people do not have heart diseas
-print('Min age of people who do not have heart disease: ', min(heart_df[heart_df['target'] == 0]['age']))
-print('Max age of people who do not have heart disease: ', max(heart_df[heart_df['target'] == 0]['age']))
-print('Average age of people who do not have heart disease: ', heart_df[heart_df['target'] == 0]['age'].mean())
+print('Min age of people who do not have heart disease: ', target_summary.loc[('age', 0), 'min'])
+print('Max age of people who do not have heart disease: ', target_summary.loc[('age', 0), 'max'])
+print('Average age of people who do not have heart disease: ', target_summary.loc[('age', 0), 'mean'])
 
 # Get min, max and average of the age of the people have heart diseas
-print('Min age of people who have heart disease: ', min(heart_df[heart_df['target'] == 1]['age']))
-print('Max age of people who have heart disease: ', max(heart_df[heart_df['target'] == 1]['age']))
-print('Average age of people who have heart disease: ', heart_df[heart_df['target'] == 1]['age'].mean())
+print('Min age of people who have heart disease: ', target_summary.loc[('age', 1), 'min'])
+print('Max age of people who have heart disease: ', target_summary.loc[('age', 1), 'max'])
+print('Average age of people who have heart disease: ', target_summary.loc[('age', 1), 'mean'])
 
 """*From above plot we can infer that People having age 40-75 are more likely to have heart disease.*
 
 ### Heart disease frequency according to chest pain types
 """
 
-pd.crosstab(heart_df.cp,heart_df.target).plot(kind = "bar", figsize = (8, 6))
-plt.title('Heart Disease Frequency According to Chest Pain Type')
-plt.xlabel('Chest Pain Type')
-plt.xticks(np.arange(4), ('typical angina', 'atypical angina', 'non-anginal pain', 'asymptomatic'), rotation = 0)
-plt.ylabel('Frequency')
+
+plots.crosstab_by_target(heart_df, 'cp', 'Heart Disease Frequency According to Chest Pain Type', 'Chest Pain Type',
+                         ('typical angina', 'atypical angina', 'non-anginal pain', 'asymptomatic'))
 plt.show()
 
 """*We can see that most of the people with the heart disease have **asymptomatic** chest pain.*
@@ -244,61 +174,50 @@ plt.show()
 ### Blood pressure distribution based on heart rate
 """
 
-fig, (axis1, axis2) = plt.subplots(1, 2,figsize=(25, 5))
-ax = sns.distplot(heart_df[heart_df['target'] == 0]['trestbps'], label='Do not have heart disease', ax = axis1)
-ax.set(xlabel='People Do Not Have Heart Disease')
-ax = sns.distplot(heart_df[heart_df['target'] == 1]['trestbps'], label = 'Have heart disease', ax = axis2)
-ax.set(xlabel='People Have Heart Disease')
+
+plots.distribution_by_target(heart_df, 'trestbps')
 plt.show()
 
 # Get min, max and average of the  blood pressure of the people do not have heart diseas
-print('Min blood pressure of people who do not have heart disease: ', min(heart_df[heart_df['target'] == 0]['trestbps']))
-print('Max blood pressure of people who do not have heart disease: ', max(heart_df[heart_df['target'] == 0]['trestbps']))
-print('Average blood pressure of people who do not have heart disease: ', heart_df[heart_df['target'] == 0]['trestbps'].mean())
+print('Min blood pressure of people who do not have heart disease: ', target_summary.loc[('trestbps', 0), 'min'])
+print('Max blood pressure of people who do not have heart disease: ', target_summary.loc[('trestbps', 0), 'max'])
+print('Average blood pressure of people who do not have heart disease: ', target_summary.loc[('trestbps', 0), 'mean'])
 
 # Get min, max and average of the blood pressure of the people have heart diseas
-print('Min blood pressure of people who have heart disease: ', min(heart_df[heart_df['target'] == 1]['trestbps']))
-print('Max blood pressure of people who have heart disease: ', max(heart_df[heart_df['target'] == 1]['trestbps']))
-print('Average blood pressure of people who have heart disease: ', heart_df[heart_df['target'] == 1]['trestbps'].mean())
+print('Min blood pressure of people who have heart disease: ', target_summary.loc[('trestbps', 1), 'min'])
+print('Max blood pressure of people who have heart disease: ', target_summary.loc[('trestbps', 1), 'max'])
+print('Average blood pressure of people who have heart disease: ', target_summary.loc[('trestbps', 1), 'mean'])
 
 """*People having blood pressure between **110 to 140** are more likely to have a heart attack*
 
 ### Cholesterol distribution based on heart disease
 """
 
-fig, (axis1, axis2) = plt.subplots(1, 2, figsize=(25, 5))
-ax = sns.distplot(heart_df[heart_df['target'] == 0]['chol'], label='Do not have heart disease', ax = axis1)
-ax.set(xlabel='People Do Not Have Heart Disease')
-ax = sns.distplot(heart_df[heart_df['target'] == 1]['chol'], label = 'Have heart disease', ax = axis2)
-ax.set(xlabel='People Have Heart Disease')
+
+plots.distribution_by_target(heart_df, 'chol')
 plt.show()
 
 # Get min, max and average of the Cholestoral of the people do not have heart diseas
-print('Min cholestoral of people who do not have heart disease: ', min(heart_df[heart_df['target'] == 0]['chol']))
-print('Max cholestoral of people who do not have heart disease: ', max(heart_df[heart_df['target'] == 0]['chol']))
-print('Average cholestoral of people who do not have heart disease: ', heart_df[heart_df['target'] == 0]['chol'].mean())
+print('Min cholestoral of people who do not have heart disease: ', target_summary.loc[('chol', 0), 'min'])
+print('Max cholestoral of people who do not have heart disease: ', target_summary.loc[('chol', 0), 'max'])
+print('Average cholestoral of people who do not have heart disease: ', target_summary.loc[('chol', 0), 'mean'])
 
 # Get min, max and average of the Cholestoral of the people have heart diseas
-print('Min cholestoral of people who have heart disease: ', min(heart_df[heart_df['target'] == 1]['chol']))
-print('Max cholestoral of people who have heart disease: ', max(heart_df[heart_df['target'] == 1]['chol']))
-print('Average cholestorale of people who have heart disease: ', heart_df[heart_df['target'] == 1]['chol'].mean())
+print('Min cholestoral of people who have heart disease: ', target_summary.loc[('chol', 1), 'min'])
+print('Max cholestoral of people who have heart disease: ', target_summary.loc[('chol', 1), 'max'])
+print('Average cholestorale of people who have heart disease: ', target_summary.loc[('chol', 1), 'mean'])
 
 """### Heart Disease Frequency According to Fasting Blood Sugar"""
 
-pd.crosstab(heart_df.fbs,heart_df.target).plot(kind = "bar", figsize = (8, 6))
-plt.title('Heart Disease Frequency According to Fasting Blood Sugar')
-plt.xlabel('Fasting Blood Sugar')
-plt.xticks(np.arange(2), ('fbs < 120 mg/dl', 'fbs > 120 mg/dl'), rotation = 0)
-plt.ylabel('Frequency')
+plots.crosstab_by_target(heart_df, 'fbs', 'Heart Disease Frequency According to Fasting Blood Sugar', 'Fasting Blood Sugar',
+                         ('fbs < 120 mg/dl', 'fbs > 120 mg/dl'))
 plt.show()
 
 """### Heart Disease Frequency According to Resting Electrocardiographic Results"""
 
-pd.crosstab(heart_df.restecg,heart_df.target).plot(kind = "bar", figsize = (8, 6))
-plt.title('Heart Disease Frequency According to Resting Electrocardiographic Results')
-plt.xticks(np.arange(3), ('normal', 'ST-T wave abnormality', 'probable or left ventricular hypertrophy'))
-plt.xlabel('Resting Electrocardiographic Results')
-plt.ylabel('Frequency')
+plots.crosstab_by_target(heart_df, 'restecg', 'Heart Disease Frequency According to Resting Electrocardiographic Results',
+                         'Resting Electrocardiographic Results',
+                         ('normal', 'ST-T wave abnormality', 'probable or left ventricular hypertrophy'))
 plt.show()
 
 """*Usually the people who do not have heart disease have normal electrocardiographic, whereas the people who have heart disease have probable or left ventricular hypertrophy.*
@@ -306,11 +225,8 @@ plt.show()
 ### Maximum heart rate distribution based on heart disease
 """
 
-fig, (axis1, axis2) = plt.subplots(1, 2, figsize=(25, 5))
-ax = sns.distplot(heart_df[heart_df['target'] == 0]['thalach'], label='Do not have heart disease', ax = axis1)
-ax.set(xlabel = 'People Do Not Have Heart Disease')
-ax = sns.distplot(heart_df[heart_df['target'] == 1]['thalach'], label = 'Have heart disease', ax = axis2)
-ax.set(xlabel = 'People Have Heart Disease')
+
+plots.distribution_by_target(heart_df, 'thalach')
 plt.show()
 
 """*The people who have high heart rate **greater than 150** are more likely to have heart disease.*
@@ -318,33 +234,28 @@ plt.show()
 ### ST depression distribution based on heart disease
 """
 
-fig, (axis1, axis2) = plt.subplots(1, 2, figsize=(25, 5))
-ax = sns.distplot(heart_df[heart_df['target'] == 0]['oldpeak'], label='Do not have heart disease', ax = axis1)
-ax.set(xlabel = 'People Do Not Have Heart Disease')
-ax = sns.distplot(heart_df[heart_df['target'] == 1]['oldpeak'], label = 'Have heart disease', ax = axis2)
-ax.set(xlabel = 'People Have Heart Disease')
+
+plots.distribution_by_target(heart_df, 'oldpeak')
 plt.show()
 
 # Get min, max and average of the ST depression  of the people have heart diseas
-print('Min ST depression of people who do not have heart disease: ', min(heart_df[heart_df['target'] == 0]['oldpeak']))
-print('Max ST depression of people who do not have heart disease: ', max(heart_df[heart_df['target'] == 0]['oldpeak']))
-print('Average ST depression of people who do not have heart disease: ', heart_df[heart_df['target'] == 0]['oldpeak'].mean())
+print('Min ST depression of people who do not have heart disease: ', target_summary.loc[('oldpeak', 0), 'min'])
+print('Max ST depression of people who do not have heart disease: ', target_summary.loc[('oldpeak', 0), 'max'])
+print('Average ST depression of people who do not have heart disease: ', target_summary.loc[('oldpeak', 0), 'mean'])
 
 # Get min, max and average of the ST depression of the people have heart diseas
-print('Min ST depression of people who have heart disease: ', min(heart_df[heart_df['target'] == 1]['oldpeak']))
-print('Max ST depression of people who have heart disease: ', max(heart_df[heart_df['target'] == 1]['oldpeak']))
-print('Average ST depression of people not have heart disease: ', heart_df[heart_df['target'] == 1]['oldpeak'].mean())
+print('Min ST depression of people who have heart disease: ', target_summary.loc[('oldpeak', 1), 'min'])
+print('Max ST depression of people who have heart disease: ', target_summary.loc[('oldpeak', 1), 'max'])
+print('Average ST depression of people not have heart disease: ', target_summary.loc[('oldpeak', 1), 'mean'])
 
 """*The average ST depression of people who do not have heart disease is 0.6 and the average ST depression of people have heart disease is 1.5.*
 
 ### Heart Disease Frequency According to Exercise Induced Angina
 """
 
-pd.crosstab(heart_df.exang,heart_df.target).plot(kind = "bar", figsize = (8, 6))
-plt.title('Heart Disease Frequency According to Exercise Induced Angina')
-plt.xlabel('Exercise Induced Angina')
-plt.xticks(np.arange(2), ('No', 'Yes'), rotation = 0)
-plt.ylabel('Frequency')
+
+plots.crosstab_by_target(heart_df, 'exang', 'Heart Disease Frequency According to Exercise Induced Angina',
+                         'Exercise Induced Angina', ('No', 'Yes'))
 plt.show()
 
 """*The people who suffer from exercise induced angina are more likely to likely to be infected with the heart disease.*
@@ -352,11 +263,9 @@ plt.show()
 ### Slope of the peak exercise ST segment based on the target
 """
 
-pd.crosstab(heart_df.slope,heart_df.target).plot(kind = "bar", figsize = (8, 6))
-plt.title('Heart Disease Frequency According to Slope of the Peak Exercise ST Segment')
-plt.xlabel('Slope')
-plt.xticks(np.arange(3), ('upsloping', 'flat', 'downsloping'), rotation = 0)
-plt.ylabel('Frequency')
+
+plots.crosstab_by_target(heart_df, 'slope', 'Heart Disease Frequency According to Slope of the Peak Exercise ST Segment',
+                         'Slope', ('upsloping', 'flat', 'downsloping'))
 plt.show()
 
 """*As we can see that,the people with flat peak ST segment are likely to have heart disease and usually the people who do not have heart disease have upsloping peak ST segment.*
@@ -364,11 +273,9 @@ plt.show()
 ### Number of vessels based on the target
 """
 
-pd.crosstab(heart_df.ca,heart_df.target).plot(kind = "bar", figsize = (8, 6))
-plt.title('Heart Disease Frequency According to Number of Major Vessels Colored by Flourosopy')
-plt.xlabel('number of vessels')
-plt.xticks(rotation = 0)
-plt.ylabel('Frequency')
+
+plots.crosstab_by_target(heart_df, 'ca', 'Heart Disease Frequency According to Number of Major Vessels Colored by Flourosopy',
+                         'number of vessels')
 plt.show()
 
 """*People who do not have heart disease usually do not have major vessels colored by flourosopy*
@@ -376,21 +283,25 @@ plt.show()
 ### Heart Disease Frequency According to Thalassemia
 """
 
-pd.crosstab(heart_df.thal,heart_df.target).plot(kind = "bar", figsize = (8, 6))
-plt.title('Heart Disease Frequency According to Thalassemia')
-plt.xlabel('Thalassemia')
-plt.xticks(np.arange(3), ('normal', 'fixed defect', 'reversible defect'), rotation = 0)
-plt.ylabel('Frequency')
+
+plots.crosstab_by_target(heart_df, 'thal', 'Heart Disease Frequency According to Thalassemia', 'Thalassemia',
+                         ('normal', 'fixed defect', 'reversible defect'))
 plt.show()
 
 """*People with reversible defect are more likely to have heart disease.*"""
 
-# Correlation map
-plt.figure(figsize=(15, 15))
-plt.title('Correlation Matrix', size=20)
-sns.heatmap(heart_df.corr(), annot = True, cmap = "Greens")
+# Correlation map, from a persisted streaming accumulator. Each batch is stored under its own name: rerunning
+# on an unchanged file is a no-op, an edited file replaces that batch's contribution, and a new patient
+# extract only costs one update() under a new name, so old rows are never rescanned or counted twice.
+correlation_path = os.path.join(cache.CACHE_DIR, 'cleveland-correlation')
+correlation = summary.CorrelationSummary.open(correlation_path, heart_df.columns)
+correlation.update(heart_df, batch=os.path.basename(data.CLEVELAND_CSV)).save(correlation_path)
+plots.correlation_heatmap(correlation)
 plt.show()
 
+# Features correlated with the target, strongest first
+print(correlation.with_target('target'))
+
 """From the above correlation plot, the chest pain type (cp), exercise induced angina (exang), ST depression induced by exercise relative to rest (oldpeak), the slope of the peak exercise ST segment (slope), number of major vessels (0-3) colored by flourosopy (ca) and thalassemia (thal) are correlated with the heart disease (target) directly. We see also that there is an inverse proportion between the heart disease and maximum heart rate (thalch).
 
 We can see also, there are a relation between the following attributes:
@@ -403,87 +314,79 @@ We can see also, there are a relation between the following attributes:
 ### Model building and traning
 """
 
-#fixing our data in x and y. Here y contains target data and X contains rest all the features.
-x= heart_df.drop(columns= 'target')
-y= heart_df.target
-
-# splitting our dataset into training and testing for this we will use train_test_split library.
-x_train, x_test, y_train, y_test= train_test_split(x, y, test_size= 0.25, random_state=42)
-print('X_train size: {}, X_test size: {}'.format(x_train.shape, x_test.shape))
+# splitting our dataset into training and testing for this we will use train_test_split library,
+# then scaling the features.
+x_train_scaler, x_test_scaler, y_train, y_test, scaler = preprocessing.split_and_scale(heart_df)
+print('X_train size: {}, X_test size: {}'.format(x_train_scaler.shape, x_test_scaler.shape))
 
 """Here I have kept **25% for testing** and the rest **75% is for training** the model."""
 
-#feature scaling
-scaler= StandardScaler()
-x_train_scaler= scaler.fit_transform(x_train)
-x_test_scaler= scaler.fit_transform(x_test)
+# creating the Logistic Regression, Knn, SVC, Random Forest and Decision Tree models
+# and training them all at the same time, one process per model.
+zoo_results, cleveland_models = zoo.train_zoo(models.cleveland_models(), x_train_scaler, y_train,
+                                              x_test_scaler, y_test)
+LR_model = cleveland_models['LR_model']
+Knn_model = cleveland_models['Knn_model']
+SVC_model = cleveland_models['SVC_model']
+RF_model = cleveland_models['RF_model']
+DT_model = cleveland_models['DT_model']
+zoo_results[['accuracy', 'fit_time']]
 
 """### Logistic Regression Model """
 
-# creating Logistic Regression Model
-LR_model= LogisticRegression()
-LR_model.fit(x_train_scaler, y_train)
-y_pred_LR= LR_model.predict(x_test_scaler)
-LR_model.score(x_test_scaler,y_test)
+evaluation.print_scores(zoo_results.loc['LR_model'])
 
-print('Classification Report\n', classification_report(y_test, y_pred_LR))
-print('Accuracy: {}%\n'.format(round((accuracy_score(y_test, y_pred_LR)*100),2)))
+"""### K-nearest-neighbor classifier """
 
-cm = confusion_matrix(y_test, y_pred_LR)
-cm
+evaluation.print_scores(zoo_results.loc['Knn_model'])
 
-"""### K-nearest-neighbor classifier """
+# For a growing reference set the same classifier can run on a persistent index that is built once,
+# loads by memory map and takes new patients without a rebuild:
+# index = neighbors.NeighborIndex.build(x_train_scaler, y_train); index.save('knn_index')
+# neighbors.NeighborIndex.load('knn_index').predict(x_test_scaler, n_neighbors=5)
 
-# creating Knn Model
-Knn_model= KNeighborsClassifier(n_neighbors = 5, metric = 'minkowski', p = 2)
-Knn_model.fit(x_train_scaler, y_train)
-y_pred_knn= Knn_model.predict(x_test_scaler)
-Knn_model.score(x_test_scaler,y_test)
+"""### Support Vector Classifier"""
 
-print('Classification Report\n', classification_report(y_test, y_pred_knn))
-print('Accuracy: {}%\n'.format(round((accuracy_score(y_test, y_pred_knn)*100),2)))
+evaluation.print_scores(zoo_results.loc['SVC_model'])
 
-cm = confusion_matrix(y_test, y_pred_knn)
-cm
+"""### Random Forest Classifier"""
 
-"""### Support Vector Classifier"""
+evaluation.print_scores(zoo_results.loc['RF_model'])
 
-SVC_model= SVC()
-SVC_model.fit(x_train_scaler, y_train)
-y_pred_SVC= SVC_model.predict(x_test_scaler)
-SVC_model.score(x_test_scaler,y_test)
+"""### Decison Tree Classifier"""
 
-print('Classification Report\n', classification_report(y_test, y_pred_SVC))
-print('Accuracy: {}%\n'.format(round((accuracy_score(y_test, y_pred_SVC)*100),2)))
+evaluation.print_scores(zoo_results.loc['DT_model'])
 
-cm = confusion_matrix(y_test, y_pred_SVC)
-cm
+"""### Comparing the models
 
-"""### Random Forest Classifier"""
+The five models' test predictions are scored together in one pass, with 95% bootstrap intervals for accuracy and macro F1."""
 
-RF_model= RandomForestClassifier(n_estimators=20)
-RF_model.fit(x_train_scaler, y_train)
-y_pred_RF= RF_model.predict(x_test_scaler)
-RF_model.score(x_test_scaler,y_test)
+cleveland_eval = evaluation.evaluate_predictions(y_test, np.stack(zoo_results['y_pred']), names=zoo_results.index)
+print(cleveland_eval['summary'].round(4))
 
-print('Classification Report\n', classification_report(y_test, y_pred_RF))
-print('Accuracy: {}%\n'.format(round((accuracy_score(y_test, y_pred_RF)*100),2)))
+"""### Cross-validation
 
-cm = confusion_matrix(y_test, y_pred_RF)
-cm
+A single 25% split is a noisy estimate, so every model is also scored with stratified 5-fold cross-validation. The scaler is fitted once per fold on that fold's training rows and shared by all five models."""
 
-"""### Decison Tree Classifier"""
+cv_results = crossval.cross_validate(models.cleveland_models(), heart_df.drop(columns='target'), heart_df['target'])
+print(crossval.summarize(cv_results))
+
+"""### Incremental training
 
-DT_model= DecisionTreeClassifier()
-DT_model.fit(x_train_scaler, y_train)
-y_pred_DT= DT_model.predict(x_test_scaler)
-DT_model.score(x_test_scaler,y_test)
+Registry exports can be far larger than this CSV. `incremental.train_incremental` streams the file in chunks, fits a running scaler and updates `partial_fit` classifiers (SGD logistic regression, naive Bayes and a linear SVM trained with SGD), so memory depends only on the chunk size. Passing `checkpoint='path.joblib'` lets an interrupted run resume."""
 
-print('Classification Report\n', classification_report(y_test, y_pred_DT))
-print('Accuracy: {}%\n'.format(round((accuracy_score(y_test, y_pred_DT)*100),2)))
+sgd_models, sgd_scaler = incremental.train_incremental(chunksize=100, epochs=10)
+sgd_scores = incremental.evaluate_incremental(sgd_models, sgd_scaler, chunksize=100)
+evaluation.print_scores(sgd_scores['SGD_LR_model'])
 
-cm = confusion_matrix(y_test, y_pred_DT)
-cm
+# Persist the scaler and the Random Forest model so new patients can be scored without retraining:
+# scoring.Scorer.load(artifact_path).predict_one({'age': 63, 'sex': 1, ...})
+# The forest is stored flattened into arrays, so scoring it needs NumPy but not sklearn.
+# To score a CSV of new patients: python -m heart_disease.predict <artifact_path> patients.csv
+# The artifact goes to the dataset cache root (HEART_DISEASE_CACHE), not the working directory.
+os.makedirs(cache.CACHE_DIR, exist_ok=True)
+artifact_path = os.path.join(cache.CACHE_DIR, 'cleveland_model.joblib')
+scoring.save_artifact(artifact_path, RF_model, scaler, compiled=True, model_name='RF_model')
 
 """Classification Accuracy is one of the most common classification evaluation metrics to compare baseline algorithms as its the number of correct prediction made as a ratio of total prediction.
 
@@ -516,44 +419,13 @@ Class 2 to 15 - Each class indicating various types of Arrhythmia.
 Class 16 - Unknowns
 """
 
-pip install tensorflow==2.9.0
+"""**Importing data**"""
 
-"""**Importing data and Libraries**"""
-
-import numpy as np
-import pandas as pd
-import keras
-import tensorflow as tf
-import ssl
-import math
-import matplotlib.pyplot as plt
-import operator
-
-from collections import defaultdict
-from sklearn import preprocessing
-from sklearn.model_selection import train_test_split, KFold
-from sklearn.impute import SimpleImputer
-from sklearn.preprocessing import normalize, StandardScaler
-from sklearn.decomposition import PCA
-from sklearn.svm import LinearSVC, SVC
-from sklearn.metrics import confusion_matrix, classification_report, f1_score,accuracy_score
-from sklearn.feature_selection import SelectFromModel
-from sklearn.ensemble import RandomForestClassifier
-
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Dense, Dropout, Flatten, LSTM
-from tensorflow.keras.layers import Conv1D, MaxPooling1D,BatchNormalization,GlobalMaxPooling1D,MaxPooling1D
-from keras.regularizers import l2,l1
-from keras.utils import to_categorical
-from tensorflow.keras.optimizers import SGD
-
-
-#from keras.optimizers import RMSprop, SGD, adam
-
-# Import the Arrhythmia dataset from the library and replace missing values by '?'.
-repo_url = "https://archive.ics.uci.edu/ml/machine-learning-databases/arrhythmia/arrhythmia.data"
-ssl._create_default_https_context = ssl._create_unverified_context
-df = pd.read_csv(repo_url, delimiter=',', header=None,)
+# Import the Arrhythmia dataset from the UCI repository; missing values are marked by '?'.
+# The parsed table is cached locally, so only the first run downloads it. On hosts
+# without network access, run data.ingest_arrhythmia('path/to/arrhythmia.data') once
+# and set HEART_DISEASE_OFFLINE=1.
+df = data.load_arrhythmia()
 
 # Make sure the data frame has 452 rows along with 280 columns. 
 df.shape
@@ -569,30 +441,10 @@ The Data Preprocessing is carried out in 3 steps:
 NOTE: The reason to replace missing attribute values with median instead of mean is to avoid the effect of outliers for attributes with higher standard deviation.
 """
 
-# Split the frame as Data attribute and Class
-df_data = df.iloc[:,:-1]
-df_class = df.iloc[:,-1]
-
-# Replace ? by NaN
-df_data = df_data.replace('?', np.NaN)
-
-# Remove unwanted columns
-# Deleting the attributes having more than 40% missing values.
-thresh = len(df_data) * 0.4
-df_data.dropna(thresh = thresh, axis = 1, inplace = True)
-
-# Replace Missing values 
-# Imputing the remaining missing values with median of the values in the column
-imp_mean = SimpleImputer(missing_values=np.NaN, strategy='median')
-imputer = imp_mean.fit(df_data)
-df_imp = imputer.transform(df_data)
-df_data = pd.DataFrame(df_imp)
-
-# Attribute Scaling
-# Normalize the values except for the class labels for each attribute using StandardScaler.
-std_scaler = StandardScaler()
-x_scaled = std_scaler.fit_transform(df_data.values) 
-df_data = pd.DataFrame(x_scaled, index = df_data.index)
+# Remove attributes with too many missing values, impute the rest with the
+# column median and standardize every attribute, in one float32 buffer. The fitted PCA and
+# feature selector are memoized on disk, so reruns on unchanged data skip those fits.
+df_data, df_class = preprocessing.preprocess_arrhythmia(df)
 
 print(df_data.shape)
 
@@ -606,33 +458,18 @@ Using the pre processed dataframe as input, the split is as follows:
 * Test - 30% - 136 records
 """
 
-# Splitting into training and testing data
-
-X_train, X_test, Y_train, Y_test = train_test_split(df_data, df_class, test_size=0.3, shuffle = True, stratify = df_class, random_state=43)
-
-# Splitting into training and validation data
-#X_train, X_val, Y_train, Y_val = train_test_split(X_trainval, Y_trainval, test_size=0.2, shuffle = True, stratify = Y_trainval, random_state=43)
+# Splitting into training and testing data. The split is written once as a float32 memory-mapped
+# file with the training rows first, so X_train and X_test are views that PCA, the feature selector
+# and the SVM grid all read without copying.
+store = features.FeatureStore.write(os.path.join(cache.CACHE_DIR, 'arrhythmia-features'), df_data, df_class)
+X_train, X_test, Y_train, Y_test = store.split()
 
 print(X_train.shape, Y_train.shape, X_test.shape, Y_test.shape)
 
 """**Determining the class weights for imbalanced dataset**"""
 
-from sklearn.utils import class_weight
-
-from sklearn.utils import class_weight
-class_wt = compute_class_weight(
-                                        class_weight = "balanced",
-                                        classes = np.unique(Y_train),
-                                        y = Y_train                                                    
-                                    )
-
-class_weights = dict(zip([1,2,3,4,5,6,7,8,9,10,14,15,16], class_wt))
-class_weights
-#class_weights[0] = 0
-#class_weights[11] = 0
-#class_weights[12] = 0
-#class_weights[13] = 0
-print(class_wt.sum())
+class_weights = preprocessing.class_weights(Y_train)
+print(sum(class_weights.values()))
 print(class_weights)
 
 print(np.bincount(Y_train))
@@ -651,45 +488,19 @@ Based on the plots select all the components with eigen value greater than or eq
 """
 
 # Implementation of PCA
-pca_dict = {}
-eigen_dict = {}
-for n_comp in df_data.columns:
-  pca = PCA(n_components=n_comp)
-  temp_train_pca = pca.fit_transform(X_train)
-  temp_test_pca = pca.transform(X_test)
-  eigen_values = pca.explained_variance_[:n_comp]
-  
-  if n_comp > 0:
-    #print (n_comp,pca.explained_variance_ratio_.sum(),eigen_values)[-1])
-    pca_dict[n_comp] = pca.explained_variance_ratio_.sum()
-    eigen_dict[n_comp] = eigen_values[-1]
-
-f = plt.figure(1)
-f.patch.set_facecolor('white')
-plt.title('PCA Variance')
-plt.xlabel('Principal Component Number')
-plt.ylabel('Variance Ratio')
-plt.plot(list(pca_dict.keys()),list(pca_dict.values()),'r')
-f.show()
-
-g = plt.figure(2)
-g.patch.set_facecolor('white')
-plt.title('PCA Eigen value')
-plt.xlabel('Principal Component Number')
-plt.ylabel('Eigen Values')
-plt.plot(list(eigen_dict.keys()),list(eigen_dict.values()),'r')
-g.show()
+pca_dict, eigen_dict = preprocessing.pca_sweep(X_train)
+
+plots.pca_curves(pca_dict, eigen_dict)
+plt.show()
 
 # Selecting components with Eigen value greater than 1 from the list
 #pca_comp_eigen = max([key for key,val in eigen_dict.items() if val >= 1])
-pca_comp_eigen = max([key for key,val in pca_dict.items() if val < 0.95])
+pca_comp_eigen = preprocessing.select_pca_components(pca_dict, 0.95)
 
 print('Components from Feature selection using PCA (Having Eigen values >=1)- ' + str(pca_comp_eigen) + '\n')
 
 # Performing PCA for the train data with the fixed components
-pca = PCA(n_components=pca_comp_eigen)
-X_train_pca = pca.fit_transform(X_train)
-X_test_pca = pca.transform(X_test)
+X_train_pca, X_test_pca, pca = preprocessing.fit_pca(X_train, X_test, pca_comp_eigen)
 print('Feature Selection using PCA complete for the train data.\n\n')
 
 """### Random Forest Classifier
@@ -701,17 +512,14 @@ The measure of impurity is by Gini index .
 """
 
 # Implementation for Random forest
-rfc = SelectFromModel(RandomForestClassifier(n_estimators = 20, random_state=0, n_jobs = -1))
-rfc.fit(X_train, Y_train)
+rfc = models.rf_feature_selector(X_train, Y_train)
 
-rfc_comp = X_train.columns[(rfc.get_support())]
+rfc_comp = store.feature_names[rfc.get_support()]
 print("Components from Feature Selection using Random Forest Classifier - ",len(rfc_comp))
 
-# Transform the model to contain only the new data.
-X_train_rfc= rfc.transform(X_train)
-X_test_rfc = rfc.transform(X_test)
-# Confirm that the transformed model has reduced components only
-print(len(X_train_rfc[0]), len(X_test_rfc[0]))
+# The forest fitted for the selection is a classifier in its own right; score it on the full test set
+rf_scores = evaluation.score_model(rfc.estimator_, X_test, Y_test)
+print('Accuracy for the selection Random Forest - ', round(rf_scores['accuracy'], 4))
 
 """**SVM implementation using PCA**
 
@@ -732,88 +540,46 @@ Below is the SVM model implementations of different types of SVM (linear, rbf an
 """
 
 # Hyperaeter tuning on regularization parameter and kernal for SVM
-c_list = [0.001, 0.01, 0.1, 1, 10, 100, 1000]
-kernals = ['linear','rbf','poly','sigmoid']
+pca_grid = models.svm_grid(X_train_pca, Y_train, X_test_pca, Y_test)
+pca_accuracy = models.grid_accuracy(pca_grid)
+
+# Fit time and solver iterations per grid cell; cells that stopped at max_iter are not converged
+pca_grid[['kernel', 'C', 'accuracy', 'fit_time', 'n_iter', 'converged']]
 
-pca_accuracy = {'linear':[], 'rbf':[], 'poly':[], 'sigmoid':[]}
-#pca_f1_score = {'linear':[], 'rbf':[], 'poly':[], 'sigmoid':[]} 
+# Accuracy and macro F1 of every grid cell with bootstrap intervals, from the stacked test predictions
+pca_eval = evaluation.evaluate_predictions(Y_test, np.stack(pca_grid['y_pred']),
+                                           names=[f'{kernel} C={c}' for kernel, c in zip(pca_grid['kernel'], pca_grid['C'])])
+print(pca_eval['summary'].round(4))
 
-for kernal in kernals:
-  for cval in c_list:
-    
-    clf = SVC(max_iter=100000, kernel=kernal, C=cval)
 
-    clf.fit(X_train_pca, Y_train)
-    pca_accuracy[kernal].append(clf.score(X_test_pca, Y_test))
-    yPred = clf.predict(X_test_pca)
-    #pca_f1_score[kernal].append(f1_score(Y_test, yPred, average='weighted'))
+def print_svm_accuracies(accuracy, label):
+  best = models.best_c(accuracy)
+  print('SVM Accuracies - ' + label + ': ')
+  print('Linear kernal has maximum accuracy - '+ str(round(best['linear'][0],4)) + ' for critical factor ' + str(best['linear'][1]))
+  print('\nRadial Basis Function Kernel SVM accuracy - '+ str(round(best['rbf'][0],4)) + ' for critical factor ' + str(best['rbf'][1]))
+  print('\nPolynomial Kernel SVM has maximum accuracy - ' + str(round(best['poly'][0],4)) + ' for critical factor ' + str(best['poly'][1]))
+  print('\nSigmoid Kernel SVM has maximum accuracy - ' + str(round(best['sigmoid'][0],4)) + ' for critical factor ' + str(best['sigmoid'][1]) +'\n\n')
 
-    del clf
-    del yPred
 
-print('SVM Accuracies - PCA: ')
-print('Linear kernal has maximum accuracy - '+ str(round(max(pca_accuracy['linear']),4)) + ' for critical factor ' + str(c_list[pca_accuracy['linear'].index(max(pca_accuracy['linear']))]) )
-print('\nRadial Basis Function Kernel SVM accuracy - '+ str(round(max(pca_accuracy['rbf']),4)) + ' for critical factor ' + str(c_list[pca_accuracy['rbf'].index(max(pca_accuracy['rbf']))]) )
-print('\nPolynomial Kernel SVM has maximum accuracy - ' + str(round(max(pca_accuracy['poly']),4)) + ' for critical factor ' + str(c_list[pca_accuracy['poly'].index(max(pca_accuracy['poly']))]))
-print('\nSigmoid Kernel SVM has maximum accuracy - ' + str(round(max(pca_accuracy['sigmoid']),4)) + ' for critical factor ' + str(c_list[pca_accuracy['sigmoid'].index(max(pca_accuracy['sigmoid']))]) +'\n\n')
+print_svm_accuracies(pca_accuracy, 'PCA')
 
 # Plot the Accuracy with C values
-fig = plt.figure(1)
-fig.patch.set_facecolor('white')
-plt.xscale('log')
-plt.title('Kernel SVM (Principle Component Analysis)')
-plt.xlabel('Critical Factor')
-plt.ylabel('Model Accuracy')
-plt.plot(c_list, pca_accuracy['linear'], 'r', label = 'Linear')
-plt.plot(c_list, pca_accuracy['rbf'], 'g', label = 'Radial Basis')
-plt.plot(c_list, pca_accuracy['poly'], 'b', label = 'Polynomial')
-plt.plot(c_list, pca_accuracy['sigmoid'], 'y', label = 'Sigmoid')
-plt.legend(bbox_to_anchor = (0., 1.02, 1., .202), loc = 10, ncol=4, borderaxespad = 0)
-fig.show()
+plots.svm_accuracy(models.C_LIST, pca_accuracy)
+plt.show()
 
 """####**SVM implementation using Random Forest Classifier**
 Below is the SVM model implementations of different types of SVM (linear, rbf and kernel) for classification of arrhythmia for the features selected by Random Forests. We will be comparing the accuracy scores of these SVM types to decide which one is better.
 """
 
-# Hyperaeter tuning on regularization parameter and kernal for SVM
-c_list = [0.001, 0.01, 0.1, 1, 10, 100, 1000]
-kernals = ['linear','rbf','poly','sigmoid']
-
-pca_accuracy = {'linear':[], 'rbf':[], 'poly':[], 'sigmoid':[]}
-#pca_f1_score = {'linear':[], 'rbf':[], 'poly':[], 'sigmoid':[]} 
-
-for kernal in kernals:
-  for cval in c_list:
-    
-    clf = SVC(max_iter=100000, kernel=kernal, C=cval)
-
-    clf.fit(X_train_pca, Y_train)
-    pca_accuracy[kernal].append(clf.score(X_test_pca, Y_test))
-    yPred = clf.predict(X_test_pca)
-    #pca_f1_score[kernal].append(f1_score(Y_test, yPred, average='weighted'))
+# Hyperaeter tuning on regularization parameter and kernal for SVM, on the columns kept by the forest
+rfc_grid = models.svm_grid(X_train, Y_train, X_test, Y_test, columns=rfc.get_support())
+rfc_accuracy = models.grid_accuracy(rfc_grid)
 
-    del clf
-    del yPred
-
-print('SVM Accuracies - PCA: ')
-print('Linear kernal has maximum accuracy - '+ str(round(max(pca_accuracy['linear']),4)) + ' for critical factor ' + str(c_list[pca_accuracy['linear'].index(max(pca_accuracy['linear']))]) )
-print('\nRadial Basis Function Kernel SVM accuracy - '+ str(round(max(pca_accuracy['rbf']),4)) + ' for critical factor ' + str(c_list[pca_accuracy['rbf'].index(max(pca_accuracy['rbf']))]) )
-print('\nPolynomial Kernel SVM has maximum accuracy - ' + str(round(max(pca_accuracy['poly']),4)) + ' for critical factor ' + str(c_list[pca_accuracy['poly'].index(max(pca_accuracy['poly']))]))
-print('\nSigmoid Kernel SVM has maximum accuracy - ' + str(round(max(pca_accuracy['sigmoid']),4)) + ' for critical factor ' + str(c_list[pca_accuracy['sigmoid'].index(max(pca_accuracy['sigmoid']))]) +'\n\n')
+print_svm_accuracies(rfc_accuracy, 'Random Forest')
 
 # Plot the Accuracy with C values
-fig = plt.figure(1)
-fig.patch.set_facecolor('white')
-plt.xscale('log')
-plt.title('Kernel SVM (Principle Component Analysis)')
-plt.xlabel('Critical Factor')
-plt.ylabel('Model Accuracy')
-plt.plot(c_list, pca_accuracy['linear'], 'r', label = 'Linear')
-plt.plot(c_list, pca_accuracy['rbf'], 'g', label = 'Radial Basis')
-plt.plot(c_list, pca_accuracy['poly'], 'b', label = 'Polynomial')
-plt.plot(c_list, pca_accuracy['sigmoid'], 'y', label = 'Sigmoid')
-plt.legend(bbox_to_anchor = (0., 1.02, 1., .202), loc = 10, ncol=4, borderaxespad = 0)
-fig.show()
+plots.svm_accuracy(models.C_LIST, rfc_accuracy, title='Kernel SVM (Random Forest Feature Selection)')
+plt.show()
 
 """### Best SVM model
 
@@ -827,10 +593,31 @@ clf = SVC(max_iter=100000, kernel='linear', C=0.01)
 
 clf.fit(X_train_pca, Y_train)
 
-yPred_svm = clf.predict(X_test_pca)
+svm_scores = evaluation.score_model(clf, X_test_pca, Y_test)
+print('Accuracy for SVM - Linear Kernal - ',round(svm_scores['accuracy'],4))
+
+print("\n",svm_scores['report'])
 
-acc = accuracy_score(yPred_svm,Y_test)
-print('Accuracy for SVM - Linear Kernal - ',round(acc,4))
+# The preprocessing statistics, the PCA projection and the linear SVM are all affine, so they fold into
+# one weight matrix: raw ECG records (with missing values) are scored by one matrix multiply, without sklearn.
+stats = store.preprocessing
+svm_scorer = linear.compile_linear(clf, pca=pca, mean=stats['mean'], scale=stats['scale'],
+                                   columns=stats['columns'], fill=stats['fill'])
+print('Folded scorer agrees with the SVM on',
+      (svm_scorer.predict(df.iloc[store.test_ids, :-1]) == clf.predict(X_test_pca)).mean() * 100, '% of test records')
+
+"""### Artificial Neural Network
+
+A network with one hidden layer trained on the same scaled features, through a `tf.data` pipeline sized for
+CPU-only hosts, with early stopping and the balanced class weights. TensorFlow is optional; the section is
+skipped when it is not installed.
+"""
 
-result = classification_report(Y_test, yPred_svm)
-print("\n",result)
\ No newline at end of file
+if neural.available():
+  network = neural.train_network(X_train, Y_train, class_weight=class_weights)
+  for epoch in network.throughput[::10]:
+    print('Epoch {epoch}: {seconds:.2f}s training, {samples_per_sec:,.0f} samples/s, loss {loss:.4f}'.format(**epoch))
+  nn_scores = evaluation.score_model(network, X_test, Y_test)
+  print('Accuracy for the Neural Network - ', round(nn_scores['accuracy'], 4))
+else:
+  print('TensorFlow is not installed; skipping the neural network.')
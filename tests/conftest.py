@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+
+
+@pytest.fixture
+def classification_data():
+    """Factory for a seeded, shifted and scaled classification problem with labels starting at 1."""
+
+    def make(n_classes, n_samples=500, n_features=12, n_informative=6):
+        X, y = make_classification(n_samples=n_samples, n_features=n_features, n_informative=n_informative,
+                                   n_classes=n_classes, random_state=0)
+        return np.asarray(X * 5 + 3), y + 1
+
+    return make
+
+
+@pytest.fixture
+def cleveland_artifact(tmp_path):
+    """Factory saving a random forest on the Cleveland data; returns ``(path, model, scaler, X)``."""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    from heart_disease import data
+    from heart_disease.scoring import FEATURES, save_artifact
+
+    def make(compiled):
+        heart = data.read_cleveland()
+        X, y = heart[FEATURES].to_numpy(dtype=np.float64), heart['condition'].to_numpy()
+        scaler = StandardScaler().fit(X)
+        model = RandomForestClassifier(n_estimators=10, random_state=0).fit(scaler.transform(X), y)
+        path = save_artifact(str(tmp_path / f'model-{compiled}.joblib'), model, scaler, compiled=compiled)
+        return path, model, scaler, X
+
+    return make
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+from sklearn.decomposition import PCA
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, cross_val_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from heart_disease.crossval import cross_validate
+
+MODELS = {
+    'logistic': LogisticRegression(max_iter=1000),
+    'tree': DecisionTreeClassifier(random_state=0),
+}
+
+
+@pytest.mark.parametrize('preprocess', [None, make_pipeline(StandardScaler(), PCA(n_components=5))])
+def test_scores_match_cross_val_score(classification_data, preprocess):
+    X, y = classification_data(3, n_samples=300)
+    results = cross_validate(MODELS, X, y, n_splits=5, preprocess=preprocess, random_state=7, max_workers=4)
+    splitter = StratifiedKFold(n_splits=5, shuffle=True, random_state=7)
+    transformer = StandardScaler() if preprocess is None else preprocess
+    for name, model in MODELS.items():
+        expected = cross_val_score(make_pipeline(transformer, model), X, y, cv=splitter, scoring='accuracy')
+        np.testing.assert_array_equal(results.loc[name, 'accuracy'].to_numpy(), expected)
+        assert results.loc[name, 'n_test'].sum() == len(y)
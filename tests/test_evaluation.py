@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, confusion_matrix, precision_recall_fscore_support
+
+from heart_disease.evaluation import evaluate_predictions
+
+
+def _predictions(classes, n_models=3, n_samples=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    y = rng.choice(classes, n_samples)
+    noise = rng.choice(classes, (n_models, n_samples))
+    return y, np.where(rng.random((n_models, n_samples)) < 0.7, y, noise)
+
+
+@pytest.mark.parametrize('classes', [[0, 1], [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 14, 15, 16]])
+def test_matches_sklearn(classes):
+    y, y_pred = _predictions(classes)
+    result = evaluate_predictions(y, y_pred, names=['a', 'b', 'c'], n_boot=200, chunk_rows=300)
+    for model, name in enumerate('abc'):
+        np.testing.assert_array_equal(result['confusion'][model], confusion_matrix(y, y_pred[model]))
+        precision, recall, f1, support = precision_recall_fscore_support(y, y_pred[model], zero_division=0)
+        per_class = result['per_class'].loc[name]
+        np.testing.assert_allclose(per_class['precision'], precision)
+        np.testing.assert_allclose(per_class['recall'], recall)
+        np.testing.assert_allclose(per_class['f1'], f1)
+        np.testing.assert_array_equal(per_class['support'], support)
+        summary = result['summary'].loc[name]
+        assert summary['accuracy'] == pytest.approx(accuracy_score(y, y_pred[model]))
+        assert summary['accuracy_low'] <= summary['accuracy'] <= summary['accuracy_high']
+        assert summary['macro_f1_low'] <= summary['macro_f1'] <= summary['macro_f1_high']
+
+
+def test_labels_keep_order_and_drop_unknown():
+    y, y_pred = _predictions([0, 1, 2, 3])
+    result = evaluate_predictions(y, y_pred, labels=[2, 0, 1], n_boot=50)
+    np.testing.assert_array_equal(result['classes'], [2, 0, 1])
+    for model in range(len(y_pred)):
+        expected = confusion_matrix(y, y_pred[model], labels=[2, 0, 1])
+        np.testing.assert_array_equal(result['confusion'][model], expected)
+    assert result['per_class'].index.get_level_values('class')[:3].tolist() == [2, 0, 1]
+
+
+def test_binary_labels_reversed():
+    y, y_pred = _predictions([0, 1])
+    result = evaluate_predictions(y, y_pred[0], labels=[1, 0], n_boot=50)
+    np.testing.assert_array_equal(result['confusion'][0], confusion_matrix(y, y_pred[0], labels=[1, 0]))
+
+
+def test_duplicate_labels_rejected():
+    with pytest.raises(ValueError):
+        evaluate_predictions([0, 1], [[0, 1]], labels=[0, 0, 1])
@@ -0,0 +1,24 @@
+import numpy as np
+
+from heart_disease.harmonize import load_harmonized, read_source
+
+VITALS = ['age', 'sex', 'trestbps', 'chol', 'fbs', 'thalach', 'exang', 'oldpeak']
+
+
+def test_recoded_heart_rows_match_cleveland():
+    cleveland, heart = read_source('cleveland'), read_source('heart')
+    assert not cleveland.duplicated(VITALS).any() and not heart.duplicated(VITALS).any()
+    matched = cleveland.merge(heart, on=VITALS, suffixes=('_cleveland', '_heart'), validate='one_to_one')
+    assert len(matched) == len(heart)
+    for column in cleveland.columns.difference(VITALS):
+        np.testing.assert_array_equal(matched[column + '_heart'], matched[column + '_cleveland'], err_msg=column)
+
+
+def test_load_harmonized_dedupes_matched_patients(tmp_path):
+    frame = load_harmonized(cache_dir=str(tmp_path))
+    assert frame.shape == (297, 15)
+    assert (frame['source'] == 0).all()
+    cleveland = read_source('cleveland')
+    for column in cleveland.columns:
+        np.testing.assert_array_equal(np.asarray(frame[column]), cleveland[column].to_numpy(), err_msg=column)
+    assert len(load_harmonized(dedupe=False, cache_dir=str(tmp_path))) == 297 + 296
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+from heart_disease.benchmark import IMPORT_BUDGET
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ('pandas', 'sklearn', 'matplotlib', 'seaborn', 'tensorflow', 'keras')
+
+
+def _importtime(code):
+    """Cumulative ``-X importtime`` microseconds per top-level module, and the modules loaded."""
+    code += f"; import sys; print(sorted(m for m in {HEAVY!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, capture_output=True,
+                         text=True, check=True)
+    cumulative = {}
+    for line in out.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, total, name = line.split('|')
+            if not name.startswith('  ') and total.strip().isdigit():
+                cumulative[name.strip()] = int(total)
+    return cumulative, out.stdout.strip()
+
+
+def test_package_import_is_within_budget():
+    cumulative, heavy = _importtime('import heart_disease')
+    assert heavy == '[]'
+    assert cumulative['heart_disease'] / 1e6 <= IMPORT_BUDGET
+
+
+def test_lazy_exports_resolve_without_heavy_imports():
+    _, heavy = _importtime('import heart_disease; heart_disease.tracing; heart_disease.schema')
+    assert heavy == '[]'
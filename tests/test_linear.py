@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from sklearn.decomposition import PCA
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC, LinearSVC
+
+from heart_disease.linear import LinearScorer, compile_linear
+
+
+@pytest.mark.parametrize('n_classes', [2, 3, 4])
+@pytest.mark.parametrize('make_model', [lambda: LogisticRegression(max_iter=1000), LinearSVC,
+                                        lambda: SVC(kernel='linear')])
+def test_predictions_match_sklearn(classification_data, n_classes, make_model):
+    X, y = classification_data(n_classes)
+    scaler = StandardScaler().fit(X)
+    pca = PCA(n_components=6).fit(scaler.transform(X))
+    Z = pca.transform(scaler.transform(X))
+    model = make_model().fit(Z, y)
+    scorer = compile_linear(model, scaler=scaler, pca=pca)
+    np.testing.assert_array_equal(scorer.predict(X), model.predict(Z))
+
+
+def test_three_class_one_vs_rest_is_not_voted(classification_data):
+    X, y = classification_data(3)
+    for model in (LogisticRegression(max_iter=1000).fit(X, y), LinearSVC().fit(X, y)):
+        assert compile_linear(model).kind == 'ovr'
+    assert compile_linear(SVC(kernel='linear').fit(X, y)).kind == 'ovo'
+
+
+def test_logistic_proba_matches_sklearn(tmp_path, classification_data):
+    X, y = classification_data(3)
+    model = LogisticRegression(max_iter=1000).fit(X, y)
+    scorer = LinearScorer.load(compile_linear(model).save(tmp_path / 'lr.joblib'))
+    np.testing.assert_allclose(scorer.predict_proba(X), model.predict_proba(X), atol=1e-10)
+
+
+def test_columns_and_fill(classification_data):
+    X, y = classification_data(2)
+    raw = np.column_stack([X, np.full(len(X), 7.0)])
+    raw[::7, 0] = np.nan
+    columns = np.arange(X.shape[1])
+    fill = np.nanmedian(raw[:, columns], axis=0)
+    filled = np.where(np.isnan(raw[:, columns]), fill, raw[:, columns])
+    model = LogisticRegression(max_iter=1000).fit(filled, y)
+    scorer = compile_linear(model, columns=columns, fill=fill)
+    np.testing.assert_array_equal(scorer.predict(raw), model.predict(filled))
@@ -0,0 +1,47 @@
+import numpy as np
+from sklearn.decomposition import PCA
+
+from heart_disease import memo
+
+
+def _count_fits(monkeypatch):
+    fits = []
+    original = PCA.fit
+
+    def fit(self, X, y=None):
+        fits.append(1)
+        return original(self, X, y)
+
+    monkeypatch.setattr(PCA, 'fit', fit)
+    return fits
+
+
+def test_hit_skips_fit_and_matches(tmp_path, monkeypatch):
+    X = np.random.default_rng(0).normal(size=(50, 5))
+    fits = _count_fits(monkeypatch)
+    first = memo.fit(PCA(n_components=2), X, memo_dir=str(tmp_path))
+    second = memo.fit(PCA(n_components=2), X, memo_dir=str(tmp_path))
+    assert len(fits) == 1
+    np.testing.assert_array_equal(first.components_, second.components_)
+
+
+def test_disabled_always_fits(tmp_path, monkeypatch):
+    X = np.random.default_rng(0).normal(size=(50, 5))
+    fits = _count_fits(monkeypatch)
+    memo.fit(PCA(n_components=2), X, memo_dir=str(tmp_path))
+    with memo.disabled():
+        memo.fit(PCA(n_components=2), X, memo_dir=str(tmp_path))
+    assert len(fits) == 2
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    X = np.arange(10.0)
+    digest = memo.key('sum', '', X)
+    with open(memo._path(digest, str(tmp_path)), 'wb') as f:
+        f.write(b'not a pickle')
+    assert memo.lookup(digest, str(tmp_path)) is None
+    assert memo.call(np.sum, X, memo_dir=str(tmp_path)) == 45.0
+
+
+def test_key_includes_library_versions():
+    assert 'scikit-learn==' in memo._versions()
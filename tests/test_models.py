@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from heart_disease.models import C_LIST, KERNELS, svm_grid
+
+
+# cells that stop at max_iter must match SVC too
+@pytest.mark.filterwarnings('ignore::sklearn.exceptions.ConvergenceWarning')
+@pytest.mark.parametrize('n_classes', [2, 3])
+def test_svm_grid_matches_plain_svc(classification_data, n_classes):
+    X, y = classification_data(n_classes, n_samples=300)
+    X = StandardScaler().fit_transform(X)
+    X_train, X_test, Y_train, Y_test = X[:200], X[200:], y[:200], y[200:]
+    grid = svm_grid(X_train, Y_train, X_test, Y_test, max_iter=100000)
+    assert set(grid['kernel']) == set(KERNELS)
+    for cell in grid.itertuples():
+        model = SVC(kernel=cell.kernel, C=cell.C, max_iter=100000).fit(X_train, Y_train)
+        y_pred = model.predict(X_test)
+        np.testing.assert_array_equal(cell.y_pred, y_pred, err_msg=f'{cell.kernel}, C={cell.C}')
+        assert cell.accuracy == pytest.approx((y_pred == Y_test).mean())
+    assert len(grid) == len(KERNELS) * len(C_LIST)
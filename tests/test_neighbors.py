@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from sklearn.neighbors import KNeighborsClassifier
+
+from heart_disease.neighbors import NeighborIndex
+
+
+def _data(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 6))
+    y = (X[:, 0] + 0.5 * rng.normal(size=n) > 0).astype(int)
+    return X, y
+
+
+def test_exact_search_matches_sklearn(tmp_path):
+    X, y = _data()
+    Q = _data(100, seed=1)[0]
+    index = NeighborIndex.load(NeighborIndex.build(X[:500], y[:500]).save(tmp_path / 'index'))
+    index.add(X[500:], y[500:])
+    knn = KNeighborsClassifier(n_neighbors=5).fit(X, y)
+    expected_d, expected_ids = knn.kneighbors(Q)
+    d, ids = index.kneighbors(Q, 5)
+    np.testing.assert_allclose(d, expected_d, atol=1e-9)
+    np.testing.assert_array_equal(np.sort(ids, axis=1), np.sort(expected_ids, axis=1))
+    np.testing.assert_allclose(index.predict_proba(Q), knn.predict_proba(Q))
+
+
+@pytest.mark.parametrize('n_probe', [1, 2])
+def test_probing_fills_k_candidates_from_small_cells(n_probe):
+    X, y = _data(200)
+    index = NeighborIndex.build(X, y, n_cells=60)
+    Q = _data(50, seed=2)[0]
+    d, ids = index.kneighbors(Q, 8, n_probe=n_probe)
+    assert (ids >= 0).all() and np.isfinite(d).all()
+    np.testing.assert_allclose(index.predict_proba(Q, 8, n_probe=n_probe).sum(axis=1), 1.0)
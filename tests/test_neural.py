@@ -0,0 +1,23 @@
+import numpy as np
+
+from heart_disease.neural import validation_split
+
+
+def test_validation_split_is_stratified():
+    labels = np.repeat([1, 2, 10], [60, 30, 10])
+    train, val = validation_split(labels, 0.2, random_state=0)
+    assert sorted(np.concatenate([train, val]).tolist()) == list(range(len(labels)))
+    classes, counts = np.unique(labels[val], return_counts=True)
+    assert dict(zip(classes.tolist(), counts.tolist())) == {1: 12, 2: 6, 10: 2}
+
+
+def test_validation_split_keeps_singleton_classes_in_training():
+    labels = np.array([1] * 20 + [2] * 10 + [3, 4])
+    train, val = validation_split(labels, 0.25, random_state=0)
+    assert {30, 31} <= set(train.tolist())
+    assert len(val) == 8 and set(labels[val].tolist()) == {1, 2}
+
+
+def test_validation_split_without_holdout():
+    train, val = validation_split(np.array([1, 1, 2]), 0.0)
+    assert train.tolist() == [0, 1, 2] and len(val) == 0
@@ -0,0 +1,75 @@
+import io
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from heart_disease.harmonize import HEART_CSV, SOURCES, recode
+from heart_disease.predict import main, predict_stream
+from heart_disease.scoring import FEATURES, Scorer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Rows of 'heart (1).csv' holding the missing thal/ca markers, then three scorable rows
+UNMAPPED = [48, 92, 158, 163, 164, 251]
+MAPPED = [0, 1, 2]
+
+
+def _input(tmp_path):
+    frame = pd.read_csv(HEART_CSV, encoding='utf-8-sig').iloc[MAPPED[:1] + UNMAPPED[:3] + MAPPED[1:] + UNMAPPED[3:]]
+    path = tmp_path / 'patients.csv'
+    frame.to_csv(path, index=False)
+    return path, frame
+
+
+def _expected(scorer, frame):
+    X = recode(frame.astype(np.float64), SOURCES['heart'])[FEATURES].to_numpy()
+    scorable = ~np.isnan(X).any(axis=1)
+    return scorable, scorer.predict_batch(X[scorable]), scorer.predict_batch(X[scorable], proba=True)
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_chunk_of_only_unmapped_rows(tmp_path, cleveland_artifact, compiled):
+    path, _, _, _ = cleveland_artifact(compiled)
+    scorer = Scorer.load(path)
+    source, frame = _input(tmp_path)
+    sink = io.StringIO()
+    # chunksize 3 makes the second and fourth chunks entirely unmapped
+    rows, _ = predict_stream(scorer, str(source), sink, chunksize=3, encoding='heart')
+    assert rows == len(frame)
+    out = pd.read_csv(io.StringIO(sink.getvalue()))
+    scorable, labels, proba = _expected(scorer, frame)
+    assert out['prediction'][~scorable].isna().all()
+    np.testing.assert_array_equal(out['prediction'][scorable].astype(int), labels)
+    np.testing.assert_allclose(out[['proba_0', 'proba_1']].to_numpy()[scorable], proba)
+    assert out[['proba_0', 'proba_1']].to_numpy()[~scorable].size and \
+        np.isnan(out[['proba_0', 'proba_1']].to_numpy()[~scorable]).all()
+
+
+def test_main_writes_file_and_reads_stdin(tmp_path, cleveland_artifact):
+    path, _, _, _ = cleveland_artifact(False)
+    source, frame = _input(tmp_path)
+    out_path = tmp_path / 'predictions.csv'
+    main([path, str(source), '--out', str(out_path), '--chunksize', '3', '--source', 'heart', '--no-proba'])
+    from_file = pd.read_csv(out_path)
+    assert list(from_file.columns) == ['prediction'] and len(from_file) == len(frame)
+
+    result = subprocess.run([sys.executable, '-m', 'heart_disease.predict', path, '-', '--chunksize', '3',
+                             '--source', 'heart', '--no-proba'], input=source.read_bytes(), cwd=ROOT,
+                            capture_output=True, check=True)
+    from_stdin = pd.read_csv(io.BytesIO(result.stdout))
+    pd.testing.assert_frame_equal(from_stdin, from_file)
+    assert b'rows in' in result.stderr
+
+
+def test_invalid_rows_fail_without_output(tmp_path, cleveland_artifact):
+    path, _, _, _ = cleveland_artifact(True)
+    source = tmp_path / 'bad.csv'
+    pd.DataFrame([[500] + [1] * 12], columns=FEATURES).to_csv(source, index=False)
+    sink = io.StringIO()
+    with pytest.raises(ValueError, match='age=500'):
+        predict_stream(Scorer.load(path), str(source), sink)
+    assert sink.getvalue() == ''
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.impute import SimpleImputer
+from sklearn.preprocessing import StandardScaler
+
+from heart_disease.preprocessing import preprocess_arrhythmia
+
+
+def _frame(n_rows=300, n_features=40, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(loc=rng.uniform(-50, 50, n_features), scale=rng.uniform(0.5, 20, n_features),
+                   size=(n_rows, n_features))
+    X[:, 3] = 7.0  # constant column
+    X[rng.random(X.shape) < 0.1] = np.nan
+    X[rng.random(n_rows) < 0.8, 5] = np.nan  # too sparse to keep
+    frame = pd.DataFrame(X)
+    frame['class'] = rng.integers(1, 17, n_rows)
+    return frame
+
+
+def _reference(frame, missing_thresh=0.4):
+    features = frame.iloc[:, :-1]
+    features = features.dropna(thresh=len(features) * missing_thresh, axis=1)
+    imputed = SimpleImputer(strategy='median').fit_transform(features)
+    return StandardScaler().fit_transform(imputed), features.columns
+
+
+@pytest.mark.parametrize('dtype, tolerance', [(np.float64, 1e-10), (np.float32, 1e-5)])
+def test_matches_sklearn_pipeline(dtype, tolerance):
+    frame = _frame()
+    expected, columns = _reference(frame)
+    df_data, df_class = preprocess_arrhythmia(frame, chunk_rows=64, dtype=dtype)
+    assert df_data.shape == expected.shape
+    np.testing.assert_allclose(df_data.to_numpy(), expected, atol=tolerance)
+    np.testing.assert_array_equal(df_class.to_numpy(), frame['class'].to_numpy())
+    np.testing.assert_array_equal(df_data.attrs['preprocessing']['columns'], columns)
+
+
+def test_chunk_iterable_matches_whole_frame():
+    frame = _frame()
+    whole, _ = preprocess_arrhythmia(frame, dtype=np.float64)
+    chunked, _ = preprocess_arrhythmia((frame.iloc[i:i + 50] for i in range(0, len(frame), 50)),
+                                       n_rows=len(frame), dtype=np.float64)
+    np.testing.assert_allclose(chunked.to_numpy(), whole.to_numpy(), atol=1e-12)
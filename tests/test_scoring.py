@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from heart_disease.scoring import Scorer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_scorer_matches_model(cleveland_artifact):
+    for compiled in (False, True):
+        path, model, scaler, X = cleveland_artifact(compiled)
+        scorer = Scorer.load(path)
+        np.testing.assert_array_equal(scorer.predict_batch(X), model.predict(scaler.transform(X)))
+        np.testing.assert_array_equal(scorer.predict_batch(X, proba=True), model.predict_proba(scaler.transform(X)))
+
+
+def test_compiled_scoring_imports_neither_pandas_nor_sklearn(cleveland_artifact):
+    path, _, _, X = cleveland_artifact(compiled=True)
+    code = ("import sys; from heart_disease.scoring import Scorer; "
+            f"Scorer.load({path!r}).predict_batch({X[:3].tolist()!r}); "
+            "print(sorted(m for m in ('pandas', 'sklearn') if m in sys.modules))")
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == '[]'
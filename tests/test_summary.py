@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from heart_disease import data
+from heart_disease.summary import SUMMARY_COLUMNS, CorrelationSummary, describe_by_target
+
+
+def _frame(n, seed):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 4))
+    X[:, 1] += X[:, 0]
+    return pd.DataFrame(X, columns=['a', 'b', 'c', 'target'])
+
+
+@pytest.mark.parametrize('chunk_rows', [None, 50])
+def test_describe_by_target_matches_groupby(chunk_rows):
+    heart = data.load_cleveland()
+    chunks = heart if chunk_rows is None else [heart.iloc[i:i + chunk_rows] for i in range(0, len(heart), chunk_rows)]
+    table = describe_by_target(chunks)
+    # load_cleveland keeps float32 columns, which pandas averages in float32
+    expected = heart.groupby('target')[SUMMARY_COLUMNS].agg(['min', 'max', 'mean'])
+    for column in SUMMARY_COLUMNS:
+        for stat in ('min', 'max', 'mean'):
+            np.testing.assert_allclose(table.loc[column, stat].to_numpy(), expected[column, stat].to_numpy(),
+                                       rtol=1e-6, err_msg=f'{column} {stat}')
+        np.testing.assert_array_equal(table.loc[column].index, expected.index)
+    assert table['count'].groupby(level='column').sum().eq(len(heart)).all()
+
+
+def test_chunks_and_merge_match_pandas():
+    frame = _frame(500, 0)
+    left = CorrelationSummary(frame.columns)
+    for start in range(0, 300, 70):
+        left.update(frame.iloc[start:min(start + 70, 300)])
+    right = CorrelationSummary(frame.columns).update(frame.iloc[300:], batch='tail')
+    left.merge(right)
+    np.testing.assert_allclose(left.correlation(), frame.corr(), atol=1e-12)
+    np.testing.assert_allclose(left.covariance(), frame.cov(), atol=1e-12)
+
+
+def test_batches_are_not_counted_twice(tmp_path):
+    frame = _frame(200, 1)
+    summary = CorrelationSummary(frame.columns).update(frame, batch='base')
+    summary.save(tmp_path / 'corr')
+    summary = CorrelationSummary.load(tmp_path / 'corr').update(frame, batch='base')
+    assert summary.count == 200
+    np.testing.assert_allclose(summary.correlation(), frame.corr(), atol=1e-12)
+
+
+def test_changed_batch_replaces_its_contribution():
+    old, new, extra = _frame(200, 1), _frame(150, 2), _frame(80, 3)
+    summary = CorrelationSummary(old.columns).update(old, batch='base').update(extra, batch='extra')
+    summary.update(new, batch='base')
+    assert summary.count == 230
+    np.testing.assert_allclose(summary.correlation(), pd.concat([new, extra]).corr(), atol=1e-12)
+
+
+def test_merge_rejects_overlapping_batches():
+    frame = _frame(100, 4)
+    left = CorrelationSummary(frame.columns).update(frame, batch='base')
+    right = CorrelationSummary(frame.columns).update(frame, batch='base')
+    with pytest.raises(ValueError):
+        left.merge(right)
+    assert left.count == 100
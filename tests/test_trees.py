@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from heart_disease.trees import CompiledTrees, compile_trees
+
+
+@pytest.mark.parametrize('n_classes', [2, 4])
+@pytest.mark.parametrize('make_model', [lambda: DecisionTreeClassifier(random_state=0),
+                                        lambda: RandomForestClassifier(n_estimators=25, random_state=0)])
+def test_bit_identical_to_sklearn(tmp_path, classification_data, n_classes, make_model):
+    X, y = classification_data(n_classes)
+    model = make_model().fit(X[:400], y[:400])
+    compiled = CompiledTrees.load(compile_trees(model).save(tmp_path / 'trees.joblib'))
+    np.testing.assert_array_equal(compiled.predict_proba(X), model.predict_proba(X))
+    np.testing.assert_array_equal(compiled.predict(X), model.predict(X))
+
+
+def test_missing_values_follow_the_learned_direction(classification_data):
+    X, y = classification_data(2)
+    X[::5, 0] = np.nan
+    model = DecisionTreeClassifier(random_state=0).fit(X, y)
+    np.testing.assert_array_equal(compile_trees(model).predict_proba(X), model.predict_proba(X))